@@ -0,0 +1,80 @@
+import os
+import json
+from datetime import datetime, timedelta
+
+# --- EXTRACTION CHECKPOINTS ---
+# Long paginated pulls write their output page by page to a JSON Lines file and
+# save a checkpoint after each page: the cursor of the next page, the pages
+# written so far and the file offset after the last complete page. A rerun
+# continues from there instead of fetching the same pages again.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CHECKPOINT_DIR = os.path.join(BASE_DIR, "data", "checkpoints")
+
+# Older checkpoints are ignored, Graph API cursors expire and new posts shift the pages.
+# Pulls whose cursors live longer pass their own max_age
+DEFAULT_MAX_AGE = timedelta(hours=24)
+
+def checkpoint_path(name):
+    return os.path.join(CHECKPOINT_DIR, f"{name}.json")
+
+def load_checkpoint(name, max_age=DEFAULT_MAX_AGE):
+    """Returns the saved state of a pull, or None if there is no usable checkpoint."""
+    path = checkpoint_path(name)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception as e:
+        print(f"WARNING: Ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+    saved_at = datetime.fromisoformat(state.get("saved_at", "1970-01-01T00:00:00"))
+    if max_age is not None and datetime.now() - saved_at > max_age:
+        print(f"INFO: Checkpoint '{name}' is older than {max_age}, starting over.")
+        return None
+
+    if not os.path.exists(state.get("output_file", "")):
+        return None
+
+    return state
+
+def save_checkpoint(name, state):
+    """Writes the checkpoint atomically, a crash never leaves a half-written file."""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    state = dict(state, saved_at=datetime.now().isoformat())
+
+    path = checkpoint_path(name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def clear_checkpoint(name):
+    path = checkpoint_path(name)
+    if os.path.exists(path):
+        os.remove(path)
+
+def open_output(filename, checkpoint=None):
+    """
+    Opens a JSON Lines output file. When resuming, anything written after the
+    checkpointed offset (a page whose checkpoint was never saved) is cut off.
+    """
+    if checkpoint is None:
+        return open(filename, "w", encoding="utf-8")
+
+    f = open(filename, "r+", encoding="utf-8")
+    f.seek(checkpoint["file_offset"])
+    f.truncate()
+    return f
+
+def write_page(f, records):
+    """
+    Appends one page to an open JSON Lines file and flushes it, so the file
+    stays loadable up to the last complete page even if a later page fails.
+    """
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False))
+        f.write("\n")
+    f.flush()
@@ -0,0 +1,236 @@
+import os
+import glob
+import time
+import numpy as np
+import pandas as pd
+
+# --- CONTENT ENRICHMENT ---
+# Batch features for post/video text, computed on whole columns with pandas
+# string methods. Texts are hashed first and every distinct text is processed
+# once, results are cached by hash so unchanged text is never processed again.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Append-only cache: every run writes the features it computed as one new part file
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "content_enrichment")
+# Parts older than this are deleted; entries still in use are carried into new parts
+CACHE_MAX_AGE = 30 * 86400
+
+FEATURE_COLUMNS = ["hashtags", "mentions", "urls", "emoji_count", "text_length", "language"]
+# Postgres types of FEATURE_COLUMNS in the bronze tables
+FEATURE_COLUMN_TYPES = {
+    "hashtags": "TEXT[]",
+    "mentions": "TEXT[]",
+    "urls": "TEXT[]",
+    "emoji_count": "INT",
+    "text_length": "INT",
+    "language": "VARCHAR(8)"
+}
+
+HASHTAG_PATTERN = r"#(\w+)"
+# Not preceded by a word character, so e-mail addresses are not mentions
+MENTION_PATTERN = r"(?<!\w)@(\w(?:[\w.]*\w)?)"
+URL_PATTERN = r"(https?://\S+|www\.\S+)"
+EMOJI_PATTERN = (
+    "[\U0001F1E6-\U0001F1FF"   # flags
+    "\U0001F300-\U0001FAFF"    # pictographs, emoticons, transport, symbols
+    "\u2600-\u27BF"            # misc symbols, dingbats
+    "\u2B00-\u2BFF]"           # arrows, stars
+)
+
+# Languages with their own script, first match wins (kana before han: Japanese uses both)
+SCRIPT_PATTERNS = [
+    ("ru", r"[\u0400-\u04FF]"),
+    ("ar", r"[\u0600-\u06FF]"),
+    ("el", r"[\u0370-\u03FF]"),
+    ("ja", r"[\u3040-\u30FF]"),
+    ("zh", r"[\u4E00-\u9FFF]"),
+    ("ko", r"[\uAC00-\uD7AF]"),
+]
+# Latin-script languages by their accented letters (matched on lowercased text).
+# Letters are shared (ö, ü, ç), so every language is scored by its letter count
+# and the highest wins, ties go to the earlier entry. İ lowercases to i + U+0307.
+LETTER_PATTERNS = [
+    ("de", r"[äöüß]"),
+    ("fr", r"[àâçéèêëîïôœùûÿ]"),
+    ("es", r"[ñáéíóúü¿¡]"),
+    ("pt", r"[ãõáâàçéêíóôú]"),
+    ("tr", "[çğıöşü\u0307]"),
+]
+LATIN_PATTERN = r"[A-Za-z]"
+UNKNOWN_LANGUAGE = "und"
+
+ISO_DURATION_PATTERN = r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?$"
+
+def ensure_feature_columns(cur, table, column_types=FEATURE_COLUMN_TYPES):
+    """Adds the feature columns to a bronze table created before the enrichment stage."""
+    for col, col_type in column_types.items():
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} {col_type};")
+
+def content_hash(texts):
+    """64-bit hash of every text, vectorized."""
+    return pd.util.hash_pandas_object(texts.fillna("").astype(str), index=False).to_numpy()
+
+def guess_language(texts):
+    """
+    Cheap script/letter based language guess ('und' when no letters).
+    Good enough to split feeds by language, not a real language detector.
+    """
+    lowered = texts.str.lower()
+    letter_counts = np.column_stack([lowered.str.count(pattern).to_numpy() for _, pattern in LETTER_PATTERNS])
+    letter_codes = np.array([code for code, _ in LETTER_PATTERNS], dtype=object)
+
+    conditions = [texts.str.contains(pattern, regex=True) for _, pattern in SCRIPT_PATTERNS]
+    choices = [code for code, _ in SCRIPT_PATTERNS]
+    conditions += [letter_counts.max(axis=1) > 0, texts.str.contains(LATIN_PATTERN, regex=True)]
+    choices += [letter_codes[letter_counts.argmax(axis=1)], "en"]
+
+    return pd.Series(np.select(conditions, choices, default=UNKNOWN_LANGUAGE), index=texts.index)
+
+def compute_text_features(texts):
+    """Feature columns for a Series of distinct texts."""
+    texts = texts.fillna("").astype(str)
+
+    return pd.DataFrame({
+        "hashtags": texts.str.findall(HASHTAG_PATTERN),
+        "mentions": texts.str.findall(MENTION_PATTERN),
+        "urls": texts.str.findall(URL_PATTERN),
+        "emoji_count": texts.str.count(EMOJI_PATTERN).astype("int64"),
+        "text_length": texts.str.len().astype("int64"),
+        "language": guess_language(texts)
+    }, index=texts.index)
+
+class FeatureCache:
+    """
+    Text features by content hash: the parts loaded from CACHE_DIR plus the
+    features computed in this run. New features are collected in a dict, so a
+    lookup or an addition only costs the size of the chunk, and are written
+    once by save_cache.
+    """
+
+    def __init__(self, stored=None, stored_at=None):
+        if stored is None:
+            stored = pd.DataFrame(columns=FEATURE_COLUMNS, index=pd.Index([], dtype="uint64", name="content_hash"))
+        self.stored = stored
+        # Save time of the part every stored row came from
+        self.stored_at = stored_at if stored_at is not None else np.zeros(len(stored))
+        self.new = {}
+
+    def lookup(self, unique_hashes):
+        """Returns (features of the known hashes indexed by hash, mask of the unknown ones)."""
+        positions = self.stored.index.get_indexer(unique_hashes)
+        in_stored = positions >= 0
+
+        # Old entries that are still in use move to this run's part before theirs expires
+        stale = np.zeros(len(positions), dtype=bool)
+        stale[in_stored] = self.stored_at[positions[in_stored]] < time.time() - CACHE_MAX_AGE / 2
+        if stale.any():
+            self.add(self.stored.iloc[positions[stale]])
+
+        in_new = np.array([h in self.new for h in unique_hashes[~in_stored]], dtype=bool)
+        new_hashes = unique_hashes[~in_stored][in_new]
+
+        known = [self.stored.iloc[positions[in_stored]]]
+        if len(new_hashes):
+            known.append(pd.DataFrame.from_records(
+                [self.new[h] for h in new_hashes], columns=FEATURE_COLUMNS,
+                index=pd.Index(new_hashes, dtype="uint64", name="content_hash")
+            ))
+
+        missing = ~in_stored
+        missing[~in_stored] = ~in_new
+        return pd.concat(known), missing
+
+    def add(self, features):
+        """Adds features indexed by hash to this run's new entries."""
+        self.new.update(zip(features.index.to_numpy(), features.itertuples(index=False, name=None)))
+
+def load_cache(cache_dir=CACHE_DIR, max_age=CACHE_MAX_AGE):
+    """Loads the part files of the cache, parts older than max_age are deleted instead."""
+    frames = []
+    stored_at = []
+
+    for path in sorted(glob.glob(os.path.join(cache_dir, "part-*.pkl")), key=os.path.getmtime):
+        saved_at = os.path.getmtime(path)
+        if time.time() - saved_at > max_age:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another loader evicted it first
+                pass
+            continue
+
+        frame = pd.read_pickle(path)
+        frames.append(frame)
+        stored_at.append(np.full(len(frame), saved_at))
+
+    if not frames:
+        return FeatureCache()
+
+    stored = pd.concat(frames)
+    stored_at = np.concatenate(stored_at)
+    # A text computed by parallel loaders is in several parts, the newest one wins
+    keep = ~stored.index.duplicated(keep="last")
+    return FeatureCache(stored[keep], stored_at[keep])
+
+def save_cache(cache, cache_dir=CACHE_DIR):
+    """Writes the features computed since the last save as one new part file."""
+    if not cache.new:
+        return None
+
+    new = pd.DataFrame.from_records(
+        list(cache.new.values()), columns=FEATURE_COLUMNS,
+        index=pd.Index(list(cache.new.keys()), dtype="uint64", name="content_hash")
+    )
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Unique per process and save, parallel loaders never write the same file
+    path = os.path.join(cache_dir, f"part-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{time.monotonic_ns()}.pkl")
+    new.to_pickle(f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+    stored = pd.concat([cache.stored, new])
+    stored_at = np.concatenate([cache.stored_at, np.full(len(new), time.time())])
+    keep = ~stored.index.duplicated(keep="last")
+    cache.stored, cache.stored_at, cache.new = stored[keep], stored_at[keep], {}
+    return path
+
+def enrich_text(df, column, cache=None, prefix=""):
+    """
+    Adds FEATURE_COLUMNS (optionally prefixed) for df[column].
+    Only texts whose hash is not in the cache are processed. Returns the
+    enriched frame and the cache with the new features added.
+    """
+    if cache is None:
+        cache = load_cache()
+
+    hashes = content_hash(df[column])
+    unique_hashes, first_rows = np.unique(hashes, return_index=True)
+    known, missing = cache.lookup(unique_hashes)
+
+    # Empty frames are left out of the concat, they would turn the columns into object
+    features = [known] if len(known) else []
+    if missing.any():
+        new_texts = df[column].iloc[first_rows[missing]]
+        computed = compute_text_features(new_texts)
+        computed.index = pd.Index(unique_hashes[missing], dtype="uint64", name="content_hash")
+        cache.add(computed)
+        features.append(computed)
+
+    enriched = (pd.concat(features) if features else known).reindex(hashes)
+    enriched.index = df.index
+    enriched.columns = [prefix + col for col in FEATURE_COLUMNS]
+
+    return pd.concat([df, enriched], axis=1), cache
+
+def iso_duration_to_seconds(durations):
+    """ISO-8601 durations (YouTube 'PT1H2M3S', 'P1DT2H') -> seconds, NaN when not parseable."""
+    parts = durations.fillna("").astype(str).str.extract(ISO_DURATION_PATTERN)
+    parts = parts.apply(pd.to_numeric, errors="coerce")
+
+    seconds = (
+        parts[0].fillna(0) * 86400 +
+        parts[1].fillna(0) * 3600 +
+        parts[2].fillna(0) * 60 +
+        parts[3].fillna(0)
+    )
+    parsed = durations.fillna("").astype(str).str.match(ISO_DURATION_PATTERN) & (durations.fillna("") != "")
+    return seconds.where(parsed)
@@ -0,0 +1,92 @@
+# --- ROW FINGERPRINTS ---
+# Current-state tables store an md5 of their mutable columns. Upserts only
+# rewrite a row when the incoming fingerprint differs, so unchanged rows
+# produce no new tuple versions, no dead tuples and no index churn.
+
+def fingerprint_sql(*columns):
+    """
+    SQL expression hashing the given column expressions.
+    ROW(...)::text keeps NULL and '' apart, unlike concat_ws.
+    """
+    return f"md5(ROW({', '.join(columns)})::text)"
+
+def ensure_fingerprint_column(cur, table):
+    """loaded_at only moves when the fingerprint changes, silver refreshes can filter on it."""
+    cur.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS row_fingerprint CHAR(32);")
+
+def changed_only(table):
+    """WHERE clause for ON CONFLICT DO UPDATE that skips rows with the same fingerprint."""
+    return f"WHERE {table}.row_fingerprint IS DISTINCT FROM EXCLUDED.row_fingerprint"
+
+def upsert_counts(cur, total_rows):
+    """
+    Reads the RETURNING (xmax = 0) rows of a change-aware upsert.
+    New rows come back True, updated rows False and unchanged rows not at all.
+    """
+    returned = cur.fetchall()
+    inserted = sum(1 for (is_insert,) in returned if is_insert)
+    updated = len(returned) - inserted
+
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": total_rows - inserted - updated
+    }
+
+def upsert_from_snapshot(cur, table, snapshot_table, captured_at, stage_columns, rows,
+                         fingerprint_columns, update_columns):
+    """
+    Change-aware upsert of a current-state table: the descriptive rows are staged
+    and joined to the metrics of the snapshot written at captured_at.
+
+    stage_columns maps column -> SQL type in the order of the row tuples, key first.
+    fingerprint_columns and update_columns name stage or snapshot metric columns,
+    the metrics are always updated. Enrichment outputs belong in the fingerprint so
+    rows loaded before enrichment get filled once.
+    Returns inserted/updated/unchanged counts.
+    """
+    from psycopg2.extras import execute_values
+    from common.snapshots import SNAPSHOT_TABLES
+
+    spec = SNAPSHOT_TABLES[snapshot_table]
+    key = spec["key"]
+    metrics = spec["metrics"]
+    stage_table = table.split(".")[1] + "_stage"
+
+    def source(col):
+        return f"s.{col}" if col in metrics else f"st.{col}"
+
+    # Kept per connection and emptied at commit, pooled connections reuse it
+    stage_ddl = ", ".join(f"{col} {col_type}" for col, col_type in stage_columns.items())
+    cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {stage_table} ({stage_ddl}) ON COMMIT DELETE ROWS;")
+    execute_values(cur, f"INSERT INTO {stage_table} ({', '.join(stage_columns)}) VALUES %s", rows, page_size=1000)
+
+    columns = list(stage_columns) + metrics
+    updates = [col for col in update_columns if col not in metrics] + metrics
+    set_clause = ",\n            ".join(f"{col} = EXCLUDED.{col}" for col in updates)
+
+    cur.execute(f"""
+        INSERT INTO {table} ({", ".join(columns)}, row_fingerprint)
+        SELECT {", ".join(source(col) for col in columns)},
+               {fingerprint_sql(*(source(col) for col in fingerprint_columns))}
+        FROM {stage_table} st
+        JOIN {snapshot_table} s
+          ON s.{key} = st.{key} AND s.captured_at = %s
+        ON CONFLICT ({key})
+        DO UPDATE SET
+            {set_clause},
+            row_fingerprint = EXCLUDED.row_fingerprint,
+            loaded_at = CURRENT_TIMESTAMP
+        {changed_only(table)}
+        RETURNING (xmax = 0);
+    """, (captured_at,))
+
+    return upsert_counts(cur, len(rows))
+
+def merge_counts(total, counts):
+    for key, value in counts.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+def format_counts(counts):
+    return f"{counts.get('inserted', 0)} inserted, {counts.get('updated', 0)} updated, {counts.get('unchanged', 0)} unchanged"
@@ -0,0 +1,144 @@
+import re
+import datetime
+
+# --- SNAPSHOT TABLES ---
+# Append-only metric history, one row per (entity, captured_at).
+# Range-partitioned by month on captured_at with a BRIN index, which stays tiny
+# because rows arrive in captured_at order. Metrics have no default: a source
+# that does not carry a metric writes NULL, never a fake 0 in the series.
+SNAPSHOT_TABLES = {
+    "bronze.facebook_post_snapshots": {
+        "key": "post_id",
+        "ddl": """
+            CREATE TABLE IF NOT EXISTS bronze.facebook_post_snapshots (
+                post_id VARCHAR(50) NOT NULL,
+                captured_at TIMESTAMP NOT NULL,
+                like_count INT,
+                comment_count INT,
+                share_count INT
+            ) PARTITION BY RANGE (captured_at);
+        """,
+        "metrics": ["like_count", "comment_count", "share_count"]
+    },
+    "bronze.youtube_video_snapshots": {
+        "key": "video_id",
+        "ddl": """
+            CREATE TABLE IF NOT EXISTS bronze.youtube_video_snapshots (
+                video_id VARCHAR(20) NOT NULL,
+                captured_at TIMESTAMP NOT NULL,
+                view_count BIGINT,
+                like_count BIGINT,
+                comment_count BIGINT
+            ) PARTITION BY RANGE (captured_at);
+        """,
+        "metrics": ["view_count", "like_count", "comment_count"]
+    }
+}
+
+# Partitions are created this many months ahead of the snapshot being written
+MONTHS_AHEAD = 1
+# Partitions whose whole month is older than this are dropped
+DEFAULT_RETENTION_MONTHS = 24
+
+PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+def month_start(value):
+    return datetime.date(value.year, value.month, 1)
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table, month):
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+def ensure_snapshot_table(cur, table):
+    """Creates the partitioned parent table and its BRIN index."""
+    index_name = table.split(".")[1] + "_captured_at_brin"
+
+    cur.execute("CREATE SCHEMA IF NOT EXISTS bronze;")
+    cur.execute(SNAPSHOT_TABLES[table]["ddl"])
+    drop_metric_defaults(cur, table)
+    cur.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING BRIN (captured_at);")
+
+def drop_metric_defaults(cur, table):
+    """
+    One-time migration of tables created with DEFAULT 0 metrics (recurses to the partitions).
+    ALTER TABLE locks the whole table against the streaming inserts, so it only runs
+    while a default is actually left.
+    """
+    schema, name = table.split(".")
+
+    cur.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s
+          AND column_name = ANY(%s) AND column_default IS NOT NULL;
+    """, (schema, name, SNAPSHOT_TABLES[table]["metrics"]))
+
+    for (metric,) in cur.fetchall():
+        cur.execute(f"ALTER TABLE {table} ALTER COLUMN {metric} DROP DEFAULT;")
+
+def ensure_partitions(cur, table, captured_at, months_ahead=MONTHS_AHEAD):
+    """Creates the monthly partition of captured_at and the next months_ahead ones."""
+    first_month = month_start(captured_at)
+
+    for offset in range(months_ahead + 1):
+        month = add_months(first_month, offset)
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS {partition_name(table, month)}
+            PARTITION OF {table}
+            FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}');
+        """)
+
+def drop_expired_partitions(cur, table, captured_at, retention_months=DEFAULT_RETENTION_MONTHS):
+    """Drops monthly partitions that ended before the retention window. Returns their names."""
+    schema, parent = table.split(".")
+    cutoff = add_months(month_start(captured_at), -retention_months)
+
+    cur.execute("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+        WHERE ns.nspname = %s AND parent.relname = %s;
+    """, (schema, parent))
+
+    dropped = []
+    for (child_name,) in cur.fetchall():
+        match = PARTITION_SUFFIX.search(child_name)
+        if not match:
+            continue
+
+        month = datetime.date(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(month, 1) <= cutoff:
+            cur.execute(f"DROP TABLE IF EXISTS {schema}.{child_name};")
+            dropped.append(child_name)
+
+    return dropped
+
+def prepare_snapshot_table(cur, table, captured_at, retention_months=DEFAULT_RETENTION_MONTHS):
+    """Makes sure a snapshot of captured_at can be written and applies retention."""
+    ensure_snapshot_table(cur, table)
+    ensure_partitions(cur, table, captured_at)
+
+    dropped = drop_expired_partitions(cur, table, captured_at, retention_months)
+    if dropped:
+        print(f"INFO: Dropped expired partitions: {', '.join(dropped)}")
+
+def write_snapshots(cur, table, captured_at, rows):
+    """
+    Bulk inserts one snapshot. Each row is (key, metric values...) in the
+    order of SNAPSHOT_TABLES[table]["metrics"].
+    """
+    from psycopg2.extras import execute_values
+
+    spec = SNAPSHOT_TABLES[table]
+    columns = [spec["key"], "captured_at"] + spec["metrics"]
+
+    execute_values(
+        cur,
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s",
+        [(row[0], captured_at) + tuple(row[1:]) for row in rows],
+        page_size=1000
+    )
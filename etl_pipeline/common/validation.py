@@ -0,0 +1,148 @@
+import os
+import json
+from datetime import datetime
+import pandas as pd
+
+# --- BATCH VALIDATION ---
+# Declarative schema per entity, checked on a whole DataFrame at once.
+# Rows that fail any check are split off with their reasons and written to
+# the quarantine folder, the bulk load only ever sees the clean rows.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+QUARANTINE_DIR = os.path.join(BASE_DIR, "data", "quarantine")
+RAW_DIR = os.path.join(BASE_DIR, "data", "raw")
+
+REASON_COLUMN = "quarantine_reason"
+
+# field -> {"type": string | int | float | timestamp | date, "required": bool, "non_negative": bool}
+SCHEMAS = {
+    "youtube_video": {
+        "video_id": {"type": "string", "required": True},
+        "title": {"type": "string"},
+        "published_at": {"type": "timestamp", "required": True},
+        "channel_title": {"type": "string"},
+        "view_count": {"type": "int", "non_negative": True},
+        "like_count": {"type": "int", "non_negative": True},
+        "comment_count": {"type": "int", "non_negative": True},
+        "duration": {"type": "string"}
+    },
+    "facebook_post": {
+        "post_id": {"type": "string", "required": True},
+        "message": {"type": "string"},
+        "created_at": {"type": "timestamp", "required": True},
+        "permalink_url": {"type": "string"},
+        "like_count": {"type": "int", "non_negative": True},
+        "comment_count": {"type": "int", "non_negative": True},
+        "share_count": {"type": "int", "non_negative": True}
+    },
+    "revenue_day": {
+        "date": {"type": "date", "required": True},
+        "total_usd": {"type": "float", "required": True, "non_negative": True}
+    },
+    "competitor_post": {
+        "post_id": {"type": "string", "required": True},
+        "post_url": {"type": "string"},
+        "text": {"type": "string"},
+        "posted_at": {"type": "timestamp"},
+        "like_count": {"type": "int", "non_negative": True},
+        "comment_count": {"type": "int", "non_negative": True},
+        "share_count": {"type": "int", "non_negative": True}
+    }
+}
+
+def parse_timestamps(values):
+    """ISO-8601 strings (with 'Z', '+0000' or no offset) -> UTC timestamps, NaT when not parseable."""
+    return pd.to_datetime(values, errors="coerce", utc=True, format="ISO8601")
+
+def check_field(df, field, spec):
+    """Returns {reason: bad row mask} for one field and the coerced column (or None)."""
+    failures = {}
+
+    if field not in df.columns:
+        if spec.get("required"):
+            failures[f"missing {field}"] = pd.Series(True, index=df.index)
+        return failures, None
+
+    values = df[field]
+    present = values.notna() & (values.astype(str).str.strip() != "")
+    coerced = None
+
+    if spec.get("required"):
+        failures[f"missing {field}"] = ~present
+
+    field_type = spec.get("type", "string")
+    if field_type in ("int", "float"):
+        coerced = pd.to_numeric(values, errors="coerce")
+        invalid = present & coerced.isna()
+        if field_type == "int":
+            invalid |= coerced.notna() & (coerced % 1 != 0)
+        failures[f"invalid {field_type} {field}"] = invalid
+        if spec.get("non_negative"):
+            failures[f"negative {field}"] = coerced < 0
+
+    elif field_type in ("timestamp", "date"):
+        failures[f"invalid {field_type} {field}"] = present & parse_timestamps(values).isna()
+
+    return failures, coerced
+
+def validate_batch(df, entity):
+    """
+    Validates a DataFrame against SCHEMAS[entity].
+    Returns (clean rows with numeric columns coerced, rejected rows with a REASON_COLUMN).
+    """
+    schema = SCHEMAS[entity]
+    masks = {}
+    coerced_columns = {}
+
+    for field, spec in schema.items():
+        failures, coerced = check_field(df, field, spec)
+        masks.update(failures)
+        if coerced is not None:
+            coerced_columns[field] = coerced
+
+    if not masks:
+        return df, df.iloc[0:0].assign(**{REASON_COLUMN: []})
+
+    masks = pd.DataFrame(masks, index=df.index).fillna(False).astype(bool)
+    bad = masks.any(axis=1)
+
+    clean = df[~bad].copy()
+    for field, coerced in coerced_columns.items():
+        clean[field] = coerced[~bad]
+
+    rejected = df[bad].copy()
+    rejected[REASON_COLUMN] = masks[bad].dot(masks.columns + "; ").str.rstrip("; ")
+
+    return clean, rejected
+
+def quarantine_name(source):
+    """
+    Source file -> quarantine file name. Files under data/raw keep their relative path,
+    so every channel partition (youtube/<channel>/youtube_videos_<date>) gets its own file.
+    """
+    path = os.path.splitext(os.path.abspath(source))[0]
+    if path.startswith(RAW_DIR + os.sep):
+        return os.path.relpath(path, RAW_DIR)
+    return os.path.basename(path)
+
+def quarantine(rejected, entity, source):
+    """Appends rejected rows with their reasons to data/quarantine/<entity>/<source>.jsonl."""
+    if rejected.empty:
+        return None
+
+    path = os.path.join(QUARANTINE_DIR, entity, f"{quarantine_name(source)}.jsonl")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    quarantined_at = datetime.now().isoformat()
+    with open(path, "a", encoding="utf-8") as f:
+        for record in rejected.astype(object).where(rejected.notna(), None).to_dict("records"):
+            record["quarantined_at"] = quarantined_at
+            f.write(json.dumps(record, ensure_ascii=False, default=str))
+            f.write("\n")
+
+    print(f"WARNING: {len(rejected)} {entity} row(s) quarantined -> {path}")
+    return path
+
+def validate_and_quarantine(df, entity, source):
+    clean, rejected = validate_batch(df, entity)
+    quarantine(rejected, entity, source)
+    return clean
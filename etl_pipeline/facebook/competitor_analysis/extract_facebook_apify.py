@@ -2,7 +2,6 @@ import os
 import json
 import datetime
 from dotenv import load_dotenv
-from apify_client import ApifyClient
 
 # --- CONFIGURATION ---
 load_dotenv()
@@ -13,8 +12,16 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.pa
 CONFIG_FILE = os.path.join(BASE_DIR, "config", "competitor_pages.json")
 OUTPUT_DIR = os.path.join(BASE_DIR, "data", "raw", "facebook")
 
-# Initialize Client
-client = ApifyClient(APIFY_TOKEN)
+# Client is created on first use, importing apify_client is slow
+_client = None
+
+def get_client():
+    """Returns the shared Apify client, creating it on first call"""
+    global _client
+    if _client is None:
+        from apify_client import ApifyClient
+        _client = ApifyClient(APIFY_TOKEN)
+    return _client
 
 def load_competitor_pages():
     """Load list of competitor Facebook pages from config file"""
@@ -51,6 +58,7 @@ def scrape_facebook_posts(page_urls, max_posts_per_page=5):
     
     try:
         # Run the Actor
+        client = get_client()
         run = client.actor("apify/facebook-posts-scraper").call(run_input=run_input)
         
         print("[INFO] Scraping job finished. Fetching results...")
@@ -83,6 +91,7 @@ def scrape_page_info(page_urls):
     print("[INFO] Sending request to Apify (apify/facebook-pages-scraper)...")
     
     try:
+        client = get_client()
         run = client.actor("apify/facebook-pages-scraper").call(run_input=run_input)
         
         items = []
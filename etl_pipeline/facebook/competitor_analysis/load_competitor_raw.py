@@ -0,0 +1,311 @@
+import os
+import io
+import sys
+import csv
+import glob
+import ijson
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# --- CONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+RAW_DIR = os.path.join(BASE_DIR, "data", "raw", "facebook")
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline"))
+
+try:
+    from common.fingerprints import fingerprint_sql, changed_only, upsert_counts, merge_counts, format_counts
+    from common.db import transaction, close_pool
+except ImportError:
+    print("[ERROR] Could not import 'common' helpers.")
+    sys.exit(1)
+
+# Items parsed from the Apify file and COPY'd per round trip, the file itself is never fully in memory
+BATCH_SIZE = 5000
+MAX_WORKERS = 4
+
+POST_COLUMNS = [
+    "post_id", "post_url", "page_name", "page_url", "text", "posted_at",
+    "like_count", "comment_count", "share_count",
+    "hashtags", "mentions", "urls", "emoji_count", "text_length", "language", "captured_at"
+]
+PAGE_COLUMNS = [
+    "page_url", "captured_at", "page_id", "page_name", "category", "like_count", "follower_count"
+]
+
+def ensure_tables(cur):
+    cur.execute("CREATE SCHEMA IF NOT EXISTS bronze;")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS bronze.competitor_posts (
+            post_id VARCHAR(255) PRIMARY KEY,
+            post_url TEXT,
+            page_name TEXT,
+            page_url TEXT,
+            text TEXT,
+            posted_at TIMESTAMP,
+            like_count INT DEFAULT 0,
+            comment_count INT DEFAULT 0,
+            share_count INT DEFAULT 0,
+            hashtags TEXT[],
+            mentions TEXT[],
+            urls TEXT[],
+            emoji_count INT,
+            text_length INT,
+            language VARCHAR(8),
+            captured_at TIMESTAMP,
+            row_fingerprint CHAR(32),
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    # Scrape time of the file the row came from, an older file never overwrites a newer one
+    cur.execute("ALTER TABLE bronze.competitor_posts ADD COLUMN IF NOT EXISTS captured_at TIMESTAMP;")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS bronze.competitor_page_snapshots (
+            page_url TEXT NOT NULL,
+            captured_at TIMESTAMP NOT NULL,
+            page_id VARCHAR(64),
+            page_name TEXT,
+            category TEXT,
+            like_count BIGINT,
+            follower_count BIGINT,
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (page_url, captured_at)
+        );
+    """)
+    # Snapshot files already loaded, reruns only pick up new ones
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS bronze.competitor_loaded_files (
+            file_name TEXT PRIMARY KEY,
+            row_count INT,
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+def get_pending_files(cur):
+    files = sorted(
+        glob.glob(os.path.join(RAW_DIR, "facebook_posts_*.json")) +
+        glob.glob(os.path.join(RAW_DIR, "facebook_pages_info_*.json"))
+    )
+    cur.execute("SELECT file_name FROM bronze.competitor_loaded_files;")
+    loaded = {row[0] for row in cur.fetchall()}
+    return [path for path in files if os.path.basename(path) not in loaded]
+
+def captured_at_from_name(path):
+    """facebook_pages_info_2026-01-31_18-05-00.json -> scrape time of the snapshot."""
+    stamp = os.path.splitext(os.path.basename(path))[0][-19:]
+    return datetime.strptime(stamp, "%Y-%m-%d_%H-%M-%S")
+
+def iter_items(path):
+    """Streams the items of a JSON array file one by one (ijson)."""
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+def iter_batches(items, size=BATCH_SIZE):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def normalize_post(item):
+    """Apify facebook-posts-scraper item -> competitor_posts row (without enrichment)."""
+    user = item.get("user") or {}
+    return {
+        "post_id": str(item.get("postId") or item.get("url") or ""),
+        "post_url": item.get("url") or item.get("topLevelUrl"),
+        "page_name": user.get("name") or item.get("pageName"),
+        "page_url": item.get("facebookUrl") or user.get("profileUrl"),
+        "text": item.get("text"),
+        "posted_at": item.get("time"),
+        "like_count": item.get("likes") or 0,
+        "comment_count": item.get("comments") or 0,
+        "share_count": item.get("shares") or 0
+    }
+
+def normalize_page(item, captured_at):
+    """Apify facebook-pages-scraper item -> competitor_page_snapshots row."""
+    categories = item.get("categories") or []
+    return {
+        "page_url": item.get("facebookUrl") or item.get("pageUrl") or item.get("url"),
+        "captured_at": captured_at,
+        "page_id": item.get("pageId"),
+        "page_name": item.get("title") or item.get("pageName"),
+        "category": ", ".join(categories) if isinstance(categories, list) else categories,
+        "like_count": item.get("likes"),
+        "follower_count": item.get("followers")
+    }
+
+def to_pg_array(values):
+    """Python list -> Postgres array literal for COPY."""
+    escaped = ('"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values)
+    return "{" + ",".join(escaped) + "}"
+
+def copy_rows(cur, table, columns, rows):
+    """COPYs dict rows into a table, lists become arrays and None becomes NULL."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            to_pg_array(row[col]) if isinstance(row[col], list) else ("" if row[col] is None else row[col])
+            for col in columns
+        ])
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+def enrich_posts(rows, cache, source):
+    """
+    Validates a batch of post rows (bad rows go to quarantine) and adds the
+    text features of the enrichment stage to the clean ones.
+    """
+    import pandas as pd
+    from common.validation import validate_and_quarantine
+    from common.enrich_content import enrich_text
+
+    df = validate_and_quarantine(pd.DataFrame(rows), "competitor_post", source)
+    if df.empty:
+        return [], cache
+
+    for col in ["like_count", "comment_count", "share_count"]:
+        df[col] = df[col].fillna(0).astype("int64")
+    df, cache = enrich_text(df, "text", cache)
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict("records"), cache
+
+def load_posts_file(cur, path):
+    from common.enrich_content import load_cache, save_cache
+
+    captured_at = captured_at_from_name(path)
+
+    cur.execute("""
+        CREATE TEMP TABLE competitor_posts_stage
+        (LIKE bronze.competitor_posts INCLUDING DEFAULTS) ON COMMIT DROP;
+    """)
+
+    # Every worker reads the cache parts and adds its new features as its own part,
+    # parallel workers never overwrite each other
+    cache = load_cache()
+    total = 0
+
+    for batch in iter_batches(iter_items(path)):
+        rows, cache = enrich_posts(list(map(normalize_post, batch)), cache, path)
+        if not rows:
+            continue
+        for row in rows:
+            row["captured_at"] = captured_at
+        copy_rows(cur, "competitor_posts_stage", POST_COLUMNS, rows)
+        total += len(rows)
+
+    save_cache(cache)
+
+    cur.execute("SELECT COUNT(DISTINCT post_id) FROM competitor_posts_stage;")
+    distinct_posts = cur.fetchone()[0]
+
+    # DISTINCT ON keeps one row per post (and takes row locks in post_id order,
+    # so parallel files touching the same posts can't deadlock).
+    # Files finish in any order, a row is only replaced by a snapshot at least as new
+    # (rows loaded before captured_at existed have none and are always replaced)
+    fingerprint = fingerprint_sql("text", "like_count", "comment_count", "share_count", "emoji_count", "language")
+    updates = ",\n            ".join(f"{col} = EXCLUDED.{col}" for col in POST_COLUMNS[1:])
+    cur.execute(f"""
+        INSERT INTO bronze.competitor_posts ({", ".join(POST_COLUMNS)}, row_fingerprint)
+        SELECT DISTINCT ON (post_id) {", ".join(POST_COLUMNS)}, {fingerprint}
+        FROM competitor_posts_stage
+        ORDER BY post_id, posted_at DESC NULLS LAST
+        ON CONFLICT (post_id)
+        DO UPDATE SET
+            {updates},
+            row_fingerprint = EXCLUDED.row_fingerprint,
+            loaded_at = CURRENT_TIMESTAMP
+        {changed_only("bronze.competitor_posts")}
+          AND (bronze.competitor_posts.captured_at IS NULL
+               OR EXCLUDED.captured_at >= bronze.competitor_posts.captured_at)
+        RETURNING (xmax = 0);
+    """)
+    return total, upsert_counts(cur, distinct_posts)
+
+def load_pages_file(cur, path):
+    captured_at = captured_at_from_name(path)
+
+    cur.execute("""
+        CREATE TEMP TABLE competitor_pages_stage
+        (LIKE bronze.competitor_page_snapshots INCLUDING DEFAULTS) ON COMMIT DROP;
+    """)
+
+    total = 0
+    for batch in iter_batches(iter_items(path)):
+        rows = [row for row in (normalize_page(item, captured_at) for item in batch) if row["page_url"]]
+        copy_rows(cur, "competitor_pages_stage", PAGE_COLUMNS, rows)
+        total += len(rows)
+
+    cur.execute(f"""
+        INSERT INTO bronze.competitor_page_snapshots ({", ".join(PAGE_COLUMNS)})
+        SELECT DISTINCT ON (page_url) {", ".join(PAGE_COLUMNS)}
+        FROM competitor_pages_stage
+        ORDER BY page_url
+        ON CONFLICT (page_url, captured_at) DO NOTHING;
+    """)
+    return total, {"inserted": cur.rowcount, "updated": 0, "unchanged": total - cur.rowcount}
+
+def load_file(path):
+    """
+    Worker: loads one snapshot file in one transaction on the worker's pooled
+    connection, so a worker pays the connection setup once for all its files.
+    The file is recorded in competitor_loaded_files in the same transaction.
+    """
+    name = os.path.basename(path)
+
+    with transaction() as conn:
+        cur = conn.cursor()
+
+        if name.startswith("facebook_posts_"):
+            total, counts = load_posts_file(cur, path)
+        else:
+            total, counts = load_pages_file(cur, path)
+
+        cur.execute(
+            "INSERT INTO bronze.competitor_loaded_files (file_name, row_count) VALUES (%s, %s);",
+            (name, total)
+        )
+
+    return total, counts
+
+def load_competitor_files(max_workers=MAX_WORKERS):
+    print("=" * 60)
+    print("COMPETITOR BRONZE LOAD")
+    print("=" * 60)
+
+    try:
+        with transaction() as conn:
+            cur = conn.cursor()
+            ensure_tables(cur)
+            pending = get_pending_files(cur)
+    finally:
+        # Connections can't be shared with forked workers, each worker opens its own pool
+        close_pool()
+
+    if not pending:
+        print("[INFO] No new competitor files to load.")
+        return {}
+
+    print(f"[INFO] {len(pending)} file(s) to load with {min(max_workers, len(pending))} worker(s)")
+    totals = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(load_file, path): path for path in pending}
+
+        for future in as_completed(futures):
+            name = os.path.basename(futures[future])
+            try:
+                total, counts = future.result()
+                merge_counts(totals, counts)
+                print(f"[SUCCESS] {name}: {total} rows ({format_counts(counts)})")
+            except Exception as e:
+                print(f"[ERROR] {name}: {e}")
+
+    print(f"\n[SYSTEM] Load finished: {format_counts(totals)}")
+    return totals
+
+if __name__ == "__main__":
+    load_competitor_files()
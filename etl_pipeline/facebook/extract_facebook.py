@@ -9,6 +9,16 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 CONFIG_PATH = os.path.join(BASE_DIR, 'config', 'facebook_token.json')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'data', 'raw')
 API_VERSION = "v24.0"
+sys.path.append(os.path.join(BASE_DIR, 'etl_pipeline'))
+
+try:
+    from common.checkpoints import load_checkpoint, save_checkpoint, clear_checkpoint, open_output, write_page
+except ImportError:
+    print("Critical Error: Could not import 'common/checkpoints.py'.")
+    sys.exit(1)
+
+# Standard engagement fields
+POST_FIELDS = "id,message,created_time,permalink_url,likes.summary(true),comments.summary(true),shares"
 
 def load_config():
     """
@@ -38,12 +48,9 @@ def fetch_posts(config):
 
     url = f"https://graph.facebook.com/{API_VERSION}/{page_id}/posts"
     
-    # Standard engagement fields
-    fields = "id,message,created_time,permalink_url,likes.summary(true),comments.summary(true),shares"
-    
     params = {
         'access_token': token,
-        'fields': fields,
+        'fields': POST_FIELDS,
         'limit': 50
     }
     
@@ -65,6 +72,103 @@ def fetch_posts(config):
         print(f"Exception while fetching posts: {e}")
         return []
 
+def iter_post_pages(config, after=None, limit=100):
+    """
+    Walks the whole post history with the Graph API 'after' cursor.
+    Yields (posts, cursor of the next page) one page at a time, the cursor is None on the last page.
+    """
+    url = f"https://graph.facebook.com/{API_VERSION}/{config.get('page_id')}/posts"
+    params = {
+        'access_token': config.get('page_access_token'),
+        'fields': POST_FIELDS,
+        'limit': limit
+    }
+
+    while True:
+        if after:
+            params['after'] = after
+
+        response = requests.get(url, params=params, timeout=30)
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code} - {response.text}")
+
+        data = response.json()
+        paging = data.get('paging', {})
+        next_after = paging.get('cursors', {}).get('after') if paging.get('next') else None
+
+        yield data.get('data', []), next_after
+
+        if not next_after:
+            return
+        after = next_after
+
+def backfill_posts(config):
+    """
+    Pulls every post of the page into a JSON Lines file, page by page.
+    The cursor is checkpointed after each page, a rerun continues where the last one stopped.
+    """
+    page_id = config.get('page_id')
+    if not config.get('page_access_token') or not page_id:
+        print("Error: Missing token or page_id.")
+        return 0
+
+    checkpoint_name = f"facebook_posts_backfill_{page_id}"
+    checkpoint = load_checkpoint(checkpoint_name)
+
+    if checkpoint and not checkpoint['next_after']:
+        # Last page was written but the run stopped before clearing the checkpoint
+        clear_checkpoint(checkpoint_name)
+        return checkpoint['posts_written']
+
+    if checkpoint:
+        filename = checkpoint['output_file']
+        written = checkpoint['posts_written']
+        pages_written = checkpoint['pages_written']
+        after = checkpoint['next_after']
+        print(f"Resuming backfill after page {pages_written} ({written} posts already saved)...")
+    else:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        date_str = datetime.datetime.now().strftime("%Y-%m-%d")
+        filename = os.path.join(OUTPUT_DIR, f"facebook_raw_posts_backfill_{date_str}.jsonl")
+        written = 0
+        pages_written = 0
+        after = None
+        print(f"Starting post backfill (API {API_VERSION})...")
+
+    f = None
+    try:
+        for posts, next_after in iter_post_pages(config, after):
+            if f is None:
+                # Opened once the first page arrived, a failed first request leaves no empty file
+                # that the loader would pick as the newest one
+                f = open_output(filename, checkpoint)
+            write_page(f, posts)
+            written += len(posts)
+            pages_written += 1
+
+            save_checkpoint(checkpoint_name, {
+                'output_file': filename,
+                'next_after': next_after,
+                'pages_written': pages_written,
+                'posts_written': written,
+                'file_offset': f.tell()
+            })
+
+        clear_checkpoint(checkpoint_name)
+        print(f"Backfill completed: {written} posts.")
+
+    except Exception as e:
+        print(f"Backfill stopped after {written} posts: {e}")
+        print("Run the backfill again to resume from the last page.")
+
+    finally:
+        if f is not None:
+            f.close()
+
+    if os.path.exists(filename):
+        print(f"Saved: {filename}")
+    return written
+
 def fetch_revenue_breakdown(config):
     """
     Fetches revenue from specific sources (Reels, Subscriptions) instead of aggregate.
@@ -136,6 +240,22 @@ def fetch_revenue_breakdown(config):
         
     return revenue_list
 
+def validate_revenue(revenue_list):
+    """
+    Checks the compiled revenue days before they are saved, days with a broken
+    date or a negative total go to the quarantine folder instead.
+    """
+    if not revenue_list:
+        return revenue_list
+
+    # pandas is only needed here, imported lazily to keep startup fast
+    import pandas as pd
+    from common.validation import validate_and_quarantine
+
+    date_str = datetime.datetime.now().strftime("%Y-%m-%d")
+    clean = validate_and_quarantine(pd.DataFrame(revenue_list), "revenue_day", f"facebook_raw_revenue_{date_str}")
+    return clean.to_dict("records")
+
 def save_data(data, file_suffix):
     """
     Saves data to a JSON file.
@@ -160,6 +280,12 @@ def main():
     print("--- FACEBOOK DATA PIPELINE ---")
     
     config = load_config()
+
+    # Full history pull, resumable: python extract_facebook.py --backfill
+    if "--backfill" in sys.argv:
+        backfill_posts(config)
+        print("--- COMPLETED ---")
+        return
     
     # 1. Fetch and Save Posts
     posts = fetch_posts(config)
@@ -168,7 +294,7 @@ def main():
     print("-" * 30)
     
     # 2. Fetch and Save Revenue (Breakdown Strategy)
-    revenue = fetch_revenue_breakdown(config)
+    revenue = validate_revenue(fetch_revenue_breakdown(config))
     save_data(revenue, "revenue")
     
     print("--- COMPLETED ---")
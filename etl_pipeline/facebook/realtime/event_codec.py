@@ -0,0 +1,74 @@
+import os
+import json
+from functools import lru_cache
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# --- WIRE FORMAT ---
+# Binary messages: [MAGIC_BYTE][schema version][msgpack array of field values]
+# The field names live in the local schema registry instead of every message.
+# JSON messages are plain objects, they start with '{' so both can share a topic.
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema_registry.json")
+MAGIC_BYTE = 0
+
+FORMAT_MSGPACK = "msgpack"
+FORMAT_JSON = "json"
+DEFAULT_FORMAT = FORMAT_MSGPACK
+
+@lru_cache(maxsize=None)
+def load_registry():
+    with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@lru_cache(maxsize=None)
+def get_schema(topic, version=None):
+    """Returns (version, field paths) of a topic, the latest version by default."""
+    entry = load_registry()[topic]
+    version = version or entry["latest"]
+    fields = entry["versions"][str(version)]["fields"]
+    return version, tuple(tuple(field.split(".")) for field in fields)
+
+def resolve_format(fmt):
+    """Falls back to JSON when msgpack is not installed."""
+    if fmt == FORMAT_MSGPACK and msgpack is None:
+        print("WARNING: msgpack is not installed, using JSON messages.")
+        return FORMAT_JSON
+    return fmt
+
+def encode_event(topic, payload, fmt=DEFAULT_FORMAT):
+    """Serializes one event with the topic's latest schema."""
+    if fmt == FORMAT_JSON or msgpack is None:
+        return json.dumps(payload).encode("utf-8")
+
+    version, fields = get_schema(topic)
+    values = []
+    for path in fields:
+        value = payload
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        values.append(value)
+
+    return bytes((MAGIC_BYTE, version)) + msgpack.packb(values, use_bin_type=True)
+
+def decode_event(topic, data):
+    """Deserializes an event written in either format back into the payload dict."""
+    if not data or data[0] != MAGIC_BYTE:
+        return json.loads(data)
+
+    if msgpack is None:
+        raise RuntimeError("Received a msgpack event but msgpack is not installed.")
+
+    _, fields = get_schema(topic, data[1])
+    values = msgpack.unpackb(data[2:], raw=False)
+
+    payload = {}
+    for path, value in zip(fields, values):
+        target = payload
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = value
+
+    return payload
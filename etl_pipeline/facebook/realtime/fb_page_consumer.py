@@ -0,0 +1,133 @@
+import sys
+import os
+from datetime import datetime
+
+# --- 1. SETUP PATHS ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+sys.path.append(os.path.dirname(os.path.dirname(current_dir)))
+
+try:
+    from event_codec import decode_event
+    from common.db import BatchSink, transaction, close_pool
+    from common.snapshots import prepare_snapshot_table, month_start
+except ImportError:
+    print("CRITICAL ERROR: Could not import 'event_codec.py' or the 'common' helpers.")
+    sys.exit(1)
+
+topic_name = "fb_realtime_events"
+group_id = "fb_realtime_events_reader"
+
+SNAPSHOT_TABLE = "bronze.facebook_post_snapshots"
+# Metrics an event does not carry (shares, or a missing count) are written as NULL
+SNAPSHOT_INSERT = f"INSERT INTO {SNAPSHOT_TABLE} (post_id, captured_at, like_count, comment_count, share_count) VALUES %s"
+
+# Month whose snapshot partitions are known to exist
+prepared_month = None
+
+def get_kafka_consumer():
+    """Initializes and returns the Kafka Consumer subscribed to the events topic."""
+    from confluent_kafka import Consumer
+
+    conf = {
+        "bootstrap.servers": "localhost:9092",
+        "group.id": group_id,
+        "auto.offset.reset": "earliest",
+        # Offsets are committed by commit_written, only after the sink has written the events
+        "enable.auto.commit": False
+    }
+    consumer = Consumer(conf)
+    consumer.subscribe([topic_name])
+    return consumer
+
+def ensure_snapshot_partitions(captured_at):
+    """Creates the partitions once per month, a long-running consumer crosses month boundaries."""
+    global prepared_month
+
+    month = month_start(captured_at)
+    if month == prepared_month:
+        return
+
+    with transaction() as conn:
+        prepare_snapshot_table(conn.cursor(), SNAPSHOT_TABLE, captured_at)
+    prepared_month = month
+
+def event_to_snapshot_row(event):
+    """
+    Decoded event -> (post_id, captured_at, like_count, comment_count, share_count), captured at ingestion time.
+    Raises ValueError for an event without post_id, the column is NOT NULL and the batch would never commit.
+    """
+    if not event.get("post_id"):
+        raise ValueError("event has no post_id")
+    captured_at = datetime.fromisoformat(event["ingested_at"]).astimezone().replace(tzinfo=None)
+    metrics = event.get("metrics") or {}
+    return (event["post_id"], captured_at, metrics.get("likes"), metrics.get("comments"), metrics.get("shares"))
+
+def commit_written(consumer, sink, asynchronous=True):
+    """Commits the offsets of the messages whose snapshot rows the sink has committed."""
+    from confluent_kafka import TopicPartition
+
+    # Tokens come back in write order, the last one of a partition is its highest offset
+    latest = {}
+    for topic, partition, offset in sink.take_written():
+        latest[(topic, partition)] = offset
+
+    if latest:
+        offsets = [TopicPartition(topic, partition, offset + 1) for (topic, partition), offset in latest.items()]
+        consumer.commit(offsets=offsets, asynchronous=asynchronous)
+
+def handle_event(event, row, sink, token):
+    metrics = event.get("metrics") or {}
+    print(f"[{event.get('source_page')}] {event['post_id']} - likes: {metrics.get('likes')}, comments: {metrics.get('comments')}")
+
+    ensure_snapshot_partitions(row[1])
+    # Queued only, the sink writes batches in the background and hands the offset back once committed
+    sink.write(row, token)
+
+def main():
+    print("Starting Page Event Consumer...")
+    consumer = get_kafka_consumer()
+    sink = BatchSink(SNAPSHOT_INSERT)
+
+    try:
+        while True:
+            commit_written(consumer, sink)
+            if sink.error is not None:
+                # Nothing after the last written batch is committed, a restart reads it again
+                print(f"Stopping, the database sink failed: {sink.error}")
+                break
+
+            msg = consumer.poll(1.0)
+
+            if msg is None:
+                continue
+            if msg.error():
+                print(f"Consumer error: {msg.error()}")
+                continue
+
+            token = (msg.topic(), msg.partition(), msg.offset())
+            try:
+                # Binary (msgpack) and JSON messages are both accepted
+                event = decode_event(topic_name, msg.value())
+                row = event_to_snapshot_row(event)
+            except Exception as e:
+                print(f"Skipped message at offset {msg.offset()}: {e}")
+                # Committed with the rows around it, a bad message is not read again
+                sink.mark(token)
+                continue
+
+            handle_event(event, row, sink, token)
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+
+    finally:
+        # Pending events are written and their offsets committed before the consumer leaves the group
+        sink.close()
+        commit_written(consumer, sink, asynchronous=False)
+        print(f"Snapshot rows written: {sink.written}")
+        consumer.close()
+        close_pool()
+
+if __name__ == "__main__":
+    main()
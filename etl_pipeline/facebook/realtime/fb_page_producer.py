@@ -1,10 +1,8 @@
 import sys
 import os
 import time
-import json
 import copy
 from datetime import datetime, timezone
-from confluent_kafka import Producer
 
 # --- 1. SETUP PATHS ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,16 +11,22 @@ sys.path.append(facebook_dir)
 
 try:
     from extract_facebook import load_config, fetch_posts
+    from event_codec import encode_event, resolve_format, DEFAULT_FORMAT
 except ImportError:
-    print("CRITICAL ERROR: Could not import 'extract_facebook.py'.")
+    print("CRITICAL ERROR: Could not import 'extract_facebook.py' or 'event_codec.py'.")
     sys.exit(1)
 
 # --- GLOBAL STATE ---
 page_states = {}
 topic_name = "fb_realtime_events"
+# 'msgpack' (schema-based binary) or 'json', set with "event_format" in the config
+event_format = DEFAULT_FORMAT
 
 def get_kafka_producer():
     """Initializes and returns the Kafka Producer."""
+    #Imported here so the module loads without pulling in librdkafka
+    from confluent_kafka import Producer
+
     conf = {
         "bootstrap.servers": "localhost:9092" # Fixed: 'services' -> 'servers'
     }
@@ -85,7 +89,7 @@ def process_page(page_id, base_config, producer):
             producer.produce(
                 topic_name,
                 key=post.get("id"),
-                value=json.dumps(payload),
+                value=encode_event(topic_name, payload, event_format),
                 callback=delivery_report
             )
             
@@ -96,19 +100,21 @@ def process_page(page_id, base_config, producer):
     return new_posts_count
 
 def main():
+    global event_format
     print("Starting Modular Page Producer...")
     
     # Initialization
     producer = get_kafka_producer()
     config = load_config()
     target_pages = get_target_pages(config)
+    event_format = resolve_format(config.get("event_format", DEFAULT_FORMAT))
     
     # Initialize State
     start_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S+0000')
     for pid in target_pages:
         page_states[pid] = start_time
         
-    print(f"Tracking {len(target_pages)} pages from: {start_time}")
+    print(f"Tracking {len(target_pages)} pages from: {start_time} ({event_format} messages)")
     print("-" * 50)
 
     try:
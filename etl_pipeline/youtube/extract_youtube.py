@@ -1,12 +1,23 @@
 import os
+import sys
 import json
 import datetime
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from googleapiclient.errors import HttpError
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from common.checkpoints import load_checkpoint, save_checkpoint, clear_checkpoint, open_output, write_page
+except ImportError:
+    print("CRITICAL ERROR: Could not import 'common/checkpoints.py'.")
+    sys.exit(1)
+
+#Heavy Google client modules (oauthlib flow, discovery, httplib2) are imported
+#inside the functions that need them, so short runs don't pay for them at startup
+
 SCOPES = [
     "https://www.googleapis.com/auth/youtube.readonly",
     "https://www.googleapis.com/auth/yt-analytics.readonly"
@@ -14,6 +25,107 @@ SCOPES = [
 
 CLIENT_SECRET_FILE = 'config/client_secret.json'
 TOKEN_FILE = 'config/youtube_token.json'
+CHANNELS_FILE = 'config/youtube_channels.json'
+#Local copies of the API discovery documents, written on first use
+DISCOVERY_CACHE_DIR = 'config/discovery'
+OUTPUT_DIR = 'data/raw/youtube'
+
+#Default Data API quota of a Google Cloud project (units per day)
+DEFAULT_DAILY_QUOTA_UNITS = 10000
+#Units spent today by every run, the API quota resets at midnight Pacific time
+QUOTA_USAGE_FILE = 'data/state/youtube_quota_usage.json'
+QUOTA_TIMEZONE = 'America/Los_Angeles'
+DEFAULT_MAX_WORKERS = 4
+#Seconds before a single API call is abandoned, so one slow channel can't hold a worker forever
+REQUEST_TIMEOUT = 60
+#Retries with backoff for transient errors (5xx, rate limits, dropped connections)
+REQUEST_RETRIES = 3
+#Playlist pageTokens don't expire, a channel stopped by the quota resumes on a later
+#quota day even when the next run starts a bit later than the last one
+CHECKPOINT_MAX_AGE = datetime.timedelta(hours=72)
+
+#One API client per worker thread, discovery clients are not thread safe
+_worker_state = threading.local()
+
+
+def quota_day():
+    """The quota day of the Data API (it resets at midnight Pacific time)."""
+    from zoneinfo import ZoneInfo
+    return datetime.datetime.now(ZoneInfo(QUOTA_TIMEZONE)).date().isoformat()
+
+
+class QuotaBudget:
+    """
+    Daily quota counter shared by every channel worker and by every run of the day.
+    channels.list, playlistItems.list and videos.list cost 1 unit per call.
+    The units spent are persisted per quota day, so a rerun only gets what is left.
+    """
+    def __init__(self, daily_units=DEFAULT_DAILY_QUOTA_UNITS, usage_file=QUOTA_USAGE_FILE):
+        self.daily_units = daily_units
+        self.usage_file = usage_file
+        self.day = quota_day()
+        self.used_units = self._load_usage()
+        self.exhausted = self.used_units >= daily_units
+        self._lock = threading.Lock()
+
+    def _load_usage(self):
+        if not self.usage_file or not os.path.exists(self.usage_file):
+            return 0
+        try:
+            with open(self.usage_file, 'r', encoding='utf-8') as f:
+                usage = json.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable quota usage file {self.usage_file}: {e}")
+            return 0
+        return usage.get("used_units", 0) if usage.get("day") == self.day else 0
+
+    def _save_usage(self):
+        if not self.usage_file:
+            return
+        os.makedirs(os.path.dirname(self.usage_file), exist_ok=True)
+        tmp_path = f"{self.usage_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"day": self.day, "used_units": self.used_units}, f)
+        os.replace(tmp_path, self.usage_file)
+
+    def _roll_day(self):
+        today = quota_day()
+        if today != self.day:
+            self.day = today
+            self.used_units = 0
+            self.exhausted = False
+
+    def spend(self, units=1):
+        """Reserves units for one call, returns False once today's budget is used up."""
+        with self._lock:
+            self._roll_day()
+            if self.exhausted or self.used_units + units > self.daily_units:
+                self.exhausted = True
+                return False
+            self.used_units += units
+            self._save_usage()
+            return True
+
+    def mark_exhausted(self):
+        """Stops every worker (and the day's later runs) after the API itself reported quotaExceeded."""
+        with self._lock:
+            self.exhausted = True
+            self.used_units = max(self.used_units, self.daily_units)
+            self._save_usage()
+
+
+class QuotaBudgetExhausted(Exception):
+    pass
+
+
+def load_channel_config():
+    """Loads the list of channel IDs to extract and the pool settings."""
+    if not os.path.exists(CHANNELS_FILE):
+        print(f"Error: Channel config not found: {CHANNELS_FILE}")
+        return {}
+
+    with open(CHANNELS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def authenticate_youtube():
     creds = None
@@ -21,15 +133,19 @@ def authenticate_youtube():
     token_path = 'config/youtube_token.json'
 
     try:
+        from google.oauth2.credentials import Credentials
+
         if os.path.exists(token_path):
             creds = Credentials.from_authorized_user_file(token_path, SCOPES)
         
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 print("Token is expired")
+                from google.auth.transport.requests import Request
                 creds.refresh(Request())
             else:
                 print("Please Login")
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
                 creds = flow.run_local_server(port=0)
 
@@ -41,126 +157,288 @@ def authenticate_youtube():
         print(f"Authentication Error: {e}")
         return None
     
-def get_video_stats(youtube, video_ids):
+@lru_cache(maxsize=None)
+def load_discovery_document(service_name, version):
+    """
+    Returns the parsed discovery document of an API, read once per process.
+    The local copy is seeded from the document bundled with google-api-python-client,
+    so building a client never fetches it over the network.
+    """
+    path = os.path.join(DISCOVERY_CACHE_DIR, f"{service_name}.{version}.json")
+
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    from googleapiclient.discovery_cache import get_static_doc
+
+    document = get_static_doc(service_name, version)
+    if document is None:
+        return None
+
+    #Written to a temp file first, workers may seed the cache at the same time
+    os.makedirs(DISCOVERY_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(document)
+    os.replace(tmp_path, path)
+
+    return json.loads(document)
+
+def build_service(service_name, version, credentials=None, http=None):
+    """Builds an API client from the local discovery document when one is available."""
+    from googleapiclient.discovery import build, build_from_document
+
+    document = load_discovery_document(service_name, version)
+    if document is not None:
+        return build_from_document(document, credentials=credentials, http=http)
+
+    return build(service_name, version, credentials=credentials, http=http, static_discovery=False)
+
+def get_worker_client(creds):
+    """Returns the YouTube client of the current worker thread, building it on first use."""
+    youtube = getattr(_worker_state, "youtube", None)
+
+    if youtube is None:
+        import google_auth_httplib2
+        import httplib2
+
+        http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=REQUEST_TIMEOUT))
+        youtube = build_service("youtube", "v3", http=http)
+        _worker_state.youtube = youtube
+
+    return youtube
+
+def execute_request(request, quota=None):
+    """Executes an API request after reserving its quota from the shared budget."""
+    if quota is not None and not quota.spend(1):
+        raise QuotaBudgetExhausted()
+    return request.execute(num_retries=REQUEST_RETRIES)
+
+def get_video_stats(youtube, video_ids, quota=None):
+    """
+    Statistics and duration of one page of videos.
+    API errors (quotaExceeded included) are not caught here: a page whose stats
+    could not be fetched must never be written or checkpointed with zero counts.
+    """
+    request = youtube.videos().list(
+        part="statistics,contentDetails",
+        id=",".join(video_ids)
+    )
+    response = execute_request(request, quota)
+
+    #ID Mapping
     stats_map = {}
-    
-    try:
-        ids_string = ",".join(video_ids)
-        request = youtube.videos().list(
-            part="statistics,contentDetails",
-            id=ids_string
-        )
-        response = request.execute()
-
-        #ID Mapping
+    for item in response.get("items", []):
+        vid_id = item["id"]
+        stats_map[vid_id] = {
+            "view_count": item["statistics"].get("viewCount", 0),
+            "like_count": item["statistics"].get("likeCount", 0),
+            "comment_count": item["statistics"].get("commentCount", 0),
+            "duration": item["contentDetails"].get("duration") # Bonus: Video süresi
+        }
+
+    return stats_map
+
+def get_uploads_playlist_id(youtube, channel_id, quota=None):
+    channel_response = execute_request(youtube.channels().list(
+        id=channel_id,
+        part="contentDetails"
+    ), quota)
+
+    if not channel_response.get("items"):
+        return None
+
+    return channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+def iter_video_pages(youtube, uploads_playlist_id, max_results=50, quota=None, page_token=None):
+    """
+    Walks the uploads playlist and yields (page of video dicts, nextPageToken) one page at a time.
+    Only the current page is held in memory, however big the channel is.
+    page_token starts the walk at a saved cursor instead of the first page.
+    """
+    request = youtube.playlistItems().list(
+        playlistId=uploads_playlist_id,
+        part='snippet,contentDetails',
+        maxResults=max_results,
+        pageToken=page_token
+    )
+
+    while request:
+        response = execute_request(request, quota)
+
+        video_ids_in_page = []
+        for item in response.get("items", []):
+            video_ids_in_page.append(item['contentDetails']['videoId'])
+
+        stats_map = {}
+        if video_ids_in_page:
+            stats_map = get_video_stats(youtube, video_ids_in_page, quota)
+
+        page = []
         for item in response.get("items", []):
-            vid_id = item["id"]
-            stats_map[vid_id] = {
-                "view_count": item["statistics"].get("viewCount", 0),
-                "like_count": item["statistics"].get("likeCount", 0),
-                "comment_count": item["statistics"].get("commentCount", 0),
-                "duration": item["contentDetails"].get("duration") # Bonus: Video süresi
+            vid_id = item['contentDetails']['videoId']
+            
+            stats = stats_map.get(vid_id, {})
+
+            video_data = {
+                'video_id': vid_id,
+                'title': item['snippet']['title'],
+                'published_at': item['snippet']['publishedAt'],
+                'channel_title': item['snippet']['channelTitle'],
+                'view_count': stats.get('view_count', 0),
+                'like_count': stats.get('like_count', 0),
+                'comment_count': stats.get('comment_count', 0),
+                'duration': stats.get('duration', "")
             }
+            page.append(video_data)
 
-    except Exception as e:
-        print(f"Statistics error: {e}")
-    
-    return stats_map
+        yield page, response.get("nextPageToken")
+
+        request = youtube.playlistItems().list_next(request, response)
+
+def get_channel_output_file(channel_id):
+    """Returns the JSON Lines file of today's extract in the channel's partition folder."""
+    channel_dir = os.path.join(OUTPUT_DIR, channel_id)
+    os.makedirs(channel_dir, exist_ok=True)
+
+    date_str = datetime.datetime.now().strftime("%Y-%m-%d")
+    return os.path.join(channel_dir, f"youtube_videos_{date_str}.jsonl")
+
+def report_api_error(channel_id, e, quota=None):
+    error_reason = json.loads(e.content)["error"]["errors"][0]["reason"]
+
+    if e.resp.status == 403:
+        if "quotaExceeded" in error_reason:
+            print("Daily Youtube API quota has been reached")
+            if quota is not None:
+                quota.mark_exhausted()
+        else:
+            print(f"[{channel_id}] Authorization Error (403): {error_reason}")
+    elif e.resp.status == 404:
+        print(f"[{channel_id}] No such Source (404)")
+    else:
+        print(f"[{channel_id}] Google API Error: {e}")
+
+def extract_channel(creds, channel_id, quota, max_results=50):
+    """
+    Worker task: streams a single channel page by page into its partition file.
+    A checkpoint is saved after every page, an interrupted channel resumes from it on the next run.
+    """
+    youtube = get_worker_client(creds)
+    checkpoint_name = f"youtube_videos_{channel_id}"
+    checkpoint = load_checkpoint(checkpoint_name, CHECKPOINT_MAX_AGE)
+    written = 0
+    filename = None
+
+    if checkpoint and not checkpoint["next_page_token"]:
+        #Last page was written but the run stopped before clearing the checkpoint
+        clear_checkpoint(checkpoint_name)
+        print(f"[{channel_id}] Already complete: {checkpoint['output_file']}")
+        return checkpoint["videos_written"]
 
-    
-def get_recent_videos(youtube, max_results=50):
-    print("Getting channel information")
     try:
-        channel_response = youtube.channels().list(
-            id='UC_x5XG1OV2P6uZZ5FSM9Ttw',
-            part="contentDetails"
-        ).execute()
-
-        if not channel_response.get("items"):
-            print("Error: No such channel")
-            return []
-        
-        uploads_playlist_id = channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
-
-        print(f"Videos coming (Playlist ID: {uploads_playlist_id}...) please wait")
-        videos = []
-
-        request = youtube.playlistItems().list(
-            playlistId=uploads_playlist_id,
-            part='snippet,contentDetails',
-            maxResults=max_results
-        )
-
-        while request:
-            response = request.execute()
-
-            video_ids_in_page = []
-            for item in response.get("items", []):
-                video_ids_in_page.append(item['contentDetails']['videoId'])
-
-            stats_map = {}
-            if video_ids_in_page:
-                stats_map = get_video_stats(youtube, video_ids_in_page)
-
-            for item in response.get("items", []):
-                vid_id = item['contentDetails']['videoId']
-                
-                stats = stats_map.get(vid_id, {})
-
-                video_data = {
-                    'video_id': vid_id,
-                    'title': item['snippet']['title'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'channel_title': item['snippet']['channelTitle'],
-                    'view_count': stats.get('view_count', 0),
-                    'like_count': stats.get('like_count', 0),
-                    'comment_count': stats.get('comment_count', 0),
-                    'duration': stats.get('duration', "")
-                }
-                videos.append(video_data)
-
-            request = youtube.playlistItems().list_next(request, response)
-
-        return videos
-    
+        if checkpoint:
+            uploads_playlist_id = checkpoint["playlist_id"]
+            filename = checkpoint["output_file"]
+            written = checkpoint["videos_written"]
+            print(f"[{channel_id}] Resuming after page {checkpoint['pages_written']} ({written} videos already saved)")
+        else:
+            print(f"[{channel_id}] Getting channel information")
+            uploads_playlist_id = get_uploads_playlist_id(youtube, channel_id, quota)
+
+            if not uploads_playlist_id:
+                print(f"[{channel_id}] Error: No such channel")
+                return 0
+
+            filename = get_channel_output_file(channel_id)
+
+        print(f"[{channel_id}] Videos coming (Playlist ID: {uploads_playlist_id}...) please wait")
+
+        page_token = checkpoint["next_page_token"] if checkpoint else None
+        pages_written = checkpoint["pages_written"] if checkpoint else 0
+
+        with open_output(filename, checkpoint) as f:
+            for page, next_page_token in iter_video_pages(youtube, uploads_playlist_id, max_results, quota, page_token):
+                write_page(f, page)
+                written += len(page)
+                pages_written += 1
+
+                save_checkpoint(checkpoint_name, {
+                    "playlist_id": uploads_playlist_id,
+                    "output_file": filename,
+                    "next_page_token": next_page_token,
+                    "pages_written": pages_written,
+                    "videos_written": written,
+                    "file_offset": f.tell()
+                })
+
+        clear_checkpoint(checkpoint_name)
+        print(f"[{channel_id}] Succesfully {written} videos got from the source")
+        print(f"[{channel_id}] File: {filename}")
+        return written
+
+    except QuotaBudgetExhausted:
+        print(f"[{channel_id}] Shared quota budget is used up, stopping the channel")
+
     except HttpError as e:
-        error_reason = json.loads(e.content)["error"]["errors"][0]["reason"]
+        report_api_error(channel_id, e, quota)
 
-        if e.resp.status == 403:
-            if "quotaExceeded" in error_reason:
-                print("Daily Youtube API quota has been reached")
-            else:
-                print(f"Authorization Error (403): {error_reason}")
-        elif e.resp.status == 404:
-            print("No such Source (404)")
-        else:
-            print(f"Google API Error: {e}")
-        return []
-    
     except Exception as e:
-        print(f"Error: {e}")
-        return []
-    
-if __name__ == "__main__":
-    creds = authenticate_youtube()
+        print(f"[{channel_id}] Error: {e}")
 
-    if creds:
-        try:
-            youtube = build("youtube", "v3", credentials=creds)
-            video_list = get_recent_videos(youtube)
+    if written:
+        print(f"[{channel_id}] Partial extract kept: {written} videos in {filename}, rerun to resume")
 
-            if video_list:
-                date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-                filename = f"data/raw/youtube_videos_{date_str}.json"
+    return written
 
-                os.makedirs("data/raw", exist_ok=True)
+def extract_channels(creds, channel_ids, max_workers=DEFAULT_MAX_WORKERS, daily_quota_units=DEFAULT_DAILY_QUOTA_UNITS):
+    """
+    Fans the channels out to a bounded worker pool sharing one quota budget.
+    Each channel finishes or fails on its own, the others keep running.
+    """
+    quota = QuotaBudget(daily_quota_units)
+    results = {}
 
-                with open(filename, "w", encoding='utf-8') as f:
-                    json.dump(video_list, f, ensure_ascii=False, indent=4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(extract_channel, creds, channel_id, quota): channel_id
+            for channel_id in channel_ids
+        }
 
-                print(f"Succesfully {len(video_list)} videos got from the source")
-                print(f"File: {filename}")
-            else:
-                print("No videos got from the source")
-        except Exception as e:
-            print(f"Error {e}")
\ No newline at end of file
+        for future in as_completed(futures):
+            channel_id = futures[future]
+            try:
+                results[channel_id] = future.result()
+            except Exception as e:
+                print(f"[{channel_id}] Worker failed: {e}")
+                results[channel_id] = 0
+
+    print(f"Quota used today ({quota.day}): {quota.used_units}/{quota.daily_units} units")
+    return results
+    
+if __name__ == "__main__":
+    channel_config = load_channel_config()
+    channel_ids = channel_config.get("channels", [])
+
+    if not channel_ids:
+        print("No channels found in config")
+    else:
+        creds = authenticate_youtube()
+
+        if creds:
+            try:
+                results = extract_channels(
+                    creds,
+                    channel_ids,
+                    max_workers=channel_config.get("max_workers", DEFAULT_MAX_WORKERS),
+                    daily_quota_units=channel_config.get("daily_quota_units", DEFAULT_DAILY_QUOTA_UNITS)
+                )
+
+                total = sum(results.values())
+                if total:
+                    print(f"Succesfully {total} videos got from {len(results)} channels")
+                else:
+                    print("No videos got from the source")
+            except Exception as e:
+                print(f"Error {e}")
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import datetime
+from googleapiclient.errors import HttpError
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from extract_youtube import authenticate_youtube, build_service
+    from common.db import transaction, close_pool
+except ImportError:
+    print("CRITICAL ERROR: Could not import 'extract_youtube.py' or 'common/db.py'.")
+    sys.exit(1)
+
+#Analytics API metric name -> bronze column
+METRIC_COLUMNS = {
+    "views": "views",
+    "estimatedMinutesWatched": "estimated_minutes_watched",
+    "averageViewDuration": "average_view_duration",
+    "averageViewPercentage": "average_view_percentage",
+    "likes": "likes",
+    "comments": "comments",
+    "shares": "shares",
+    "subscribersGained": "subscribers_gained"
+}
+
+DEFAULT_START_DATE = datetime.date(2026, 1, 1)
+#Each report call covers at most this many days
+CHUNK_DAYS = 30
+#Largest page reports.query returns for the video dimension
+PAGE_SIZE = 200
+#Analytics data is only complete after a couple of days
+REPORTING_LAG_DAYS = 2
+
+def ensure_fact_table(cur):
+    cur.execute("CREATE SCHEMA IF NOT EXISTS bronze;")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS bronze.youtube_video_daily_metrics (
+            video_id VARCHAR(20) NOT NULL,
+            day DATE NOT NULL,
+            views BIGINT DEFAULT 0,
+            estimated_minutes_watched BIGINT DEFAULT 0,
+            average_view_duration INT DEFAULT 0,
+            average_view_percentage NUMERIC(6, 2) DEFAULT 0,
+            likes INT DEFAULT 0,
+            comments INT DEFAULT 0,
+            shares INT DEFAULT 0,
+            subscribers_gained INT DEFAULT 0,
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (video_id, day)
+        );
+    """)
+
+def get_last_loaded_day(cur):
+    cur.execute("SELECT MAX(day) FROM bronze.youtube_video_daily_metrics;")
+    return cur.fetchone()[0]
+
+def iter_date_chunks(start_date, end_date, chunk_days=CHUNK_DAYS):
+    """Splits [start_date, end_date] into consecutive ranges of chunk_days."""
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + datetime.timedelta(days=chunk_days - 1), end_date)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end + datetime.timedelta(days=1)
+
+def fetch_report_chunk(analytics, start_date, end_date):
+    """
+    Pulls the day x video report of one date range, following startIndex pagination.
+    One call returns up to PAGE_SIZE (video, day) rows instead of one call per video.
+    """
+    rows = []
+    start_index = 1
+
+    while True:
+        response = analytics.reports().query(
+            ids="channel==MINE",
+            startDate=start_date.isoformat(),
+            endDate=end_date.isoformat(),
+            metrics=",".join(METRIC_COLUMNS),
+            dimensions="day,video",
+            sort="day",
+            maxResults=PAGE_SIZE,
+            startIndex=start_index
+        ).execute()
+
+        headers = [header["name"] for header in response.get("columnHeaders", [])]
+        page_rows = response.get("rows", [])
+
+        for row in page_rows:
+            record = dict(zip(headers, row))
+            rows.append(
+                (record["video"], record["day"]) +
+                tuple(record.get(metric, 0) for metric in METRIC_COLUMNS)
+            )
+
+        if len(page_rows) < PAGE_SIZE:
+            return rows
+
+        start_index += PAGE_SIZE
+
+def load_report_rows(cur, rows):
+    """Bulk upserts report rows, recent days are restated so they are overwritten."""
+    #psycopg2 is imported lazily to keep startup fast
+    from psycopg2.extras import execute_values
+
+    columns = ["video_id", "day"] + list(METRIC_COLUMNS.values())
+    updates = ",\n            ".join(f"{col} = EXCLUDED.{col}" for col in METRIC_COLUMNS.values())
+
+    sql = f"""
+        INSERT INTO bronze.youtube_video_daily_metrics ({", ".join(columns)})
+        VALUES %s
+        ON CONFLICT (video_id, day)
+        DO UPDATE SET
+            {updates},
+            loaded_at = CURRENT_TIMESTAMP;
+    """
+    execute_values(cur, sql, rows, page_size=1000)
+
+def load_video_analytics(analytics):
+    with transaction() as conn:
+        cur = conn.cursor()
+        ensure_fact_table(cur)
+        #Incremental: the last loaded day is pulled again because it may have been partial
+        last_day = get_last_loaded_day(cur)
+
+    start_date = last_day or DEFAULT_START_DATE
+    end_date = datetime.date.today() - datetime.timedelta(days=REPORTING_LAG_DAYS)
+
+    if start_date > end_date:
+        print("Analytics already up to date")
+        return 0
+
+    print(f"Loading video analytics from {start_date} to {end_date}")
+    total_rows = 0
+
+    for chunk_start, chunk_end in iter_date_chunks(start_date, end_date):
+        #No connection is held while the report is fetched
+        rows = fetch_report_chunk(analytics, chunk_start, chunk_end)
+
+        if rows:
+            #Committing per chunk keeps the loaded days if a later chunk fails
+            with transaction() as conn:
+                load_report_rows(conn.cursor(), rows)
+
+        total_rows += len(rows)
+        print(f"{chunk_start} - {chunk_end}: {len(rows)} rows")
+
+    return total_rows
+
+if __name__ == "__main__":
+    creds = authenticate_youtube()
+
+    if creds:
+        try:
+            analytics = build_service("youtubeAnalytics", "v2", credentials=creds)
+
+            total = load_video_analytics(analytics)
+            print(f"Succesfully {total} rows inserted into 'bronze.youtube_video_daily_metrics'")
+
+        except HttpError as e:
+            error_reason = json.loads(e.content)["error"]["errors"][0]["reason"]
+            print(f"Google API Error ({e.resp.status}): {error_reason}")
+
+        except Exception as e:
+            print(f"Error: {e}")
+
+        finally:
+            close_pool()
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+
+#Benchmark: bytes/message and encode/decode throughput of the msgpack event
+#encoding against the JSON payload built by create_kafka_payload.
+#Run from the project root: python tests/bench_event_codec.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline", "facebook", "realtime"))
+
+from fb_page_producer import create_kafka_payload, topic_name
+from event_codec import encode_event, decode_event, FORMAT_JSON, FORMAT_MSGPACK, msgpack
+
+MESSAGES = 50000
+
+def sample_posts(count):
+    """Graph API shaped posts with varying message lengths."""
+    posts = []
+    for i in range(count):
+        posts.append({
+            "id": f"104857600000000_{900000000000000 + i}",
+            "message": "Yeni bölüm yayında! " * (i % 8),
+            "created_time": "2026-10-19T08:30:00+0000",
+            "likes": {"summary": {"total_count": i * 7 % 5000}},
+            "comments": {"summary": {"total_count": i * 3 % 400}}
+        })
+    return posts
+
+def run(fmt, payloads):
+    start = time.perf_counter()
+    encoded = [encode_event(topic_name, payload, fmt) for payload in payloads]
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in encoded:
+        decode_event(topic_name, data)
+    decode_seconds = time.perf_counter() - start
+
+    total_bytes = sum(len(data) for data in encoded)
+    return total_bytes / len(encoded), len(encoded) / encode_seconds, len(encoded) / decode_seconds
+
+def main():
+    if msgpack is None:
+        print("msgpack is not installed, nothing to compare.")
+        sys.exit(1)
+
+    payloads = [create_kafka_payload("104857600000000", post) for post in sample_posts(MESSAGES)]
+    assert decode_event(topic_name, encode_event(topic_name, payloads[1], FORMAT_MSGPACK)) == payloads[1]
+
+    print(f"--- EVENT CODEC BENCHMARK ({MESSAGES} messages) ---")
+    results = {}
+    for fmt in (FORMAT_JSON, FORMAT_MSGPACK):
+        results[fmt] = run(fmt, payloads)
+        size, encode_rate, decode_rate = results[fmt]
+        print(f"{fmt:8} {size:8.1f} bytes/msg  encode {encode_rate:10,.0f} msg/s  decode {decode_rate:10,.0f} msg/s")
+
+    json_size = results[FORMAT_JSON][0]
+    msgpack_size = results[FORMAT_MSGPACK][0]
+    print("-" * 30)
+    print(f"msgpack messages are {100 * (1 - msgpack_size / json_size):.1f}% smaller than JSON")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import subprocess
+import statistics
+
+#Startup-time benchmark: measures the import cost of every entry point with
+#`python -X importtime` and fails when one goes over its budget.
+#Run from the project root: python tests/bench_startup.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+#(script path, import budget in milliseconds)
+ENTRY_POINTS = [
+    ("etl_pipeline/youtube/extract_youtube.py", 60),
+    ("etl_pipeline/youtube/extract_youtube_analytics.py", 150),
+    ("etl_pipeline/youtube/load_youtube_raw.py", 20),
+    ("etl_pipeline/facebook/extract_facebook.py", 250),
+    ("etl_pipeline/facebook/history_batch/load_facebook_raw.py", 150),
+    ("etl_pipeline/facebook/history_batch/read_facebook_data.py", 800),
+    ("etl_pipeline/facebook/realtime/fb_page_producer.py", 250),
+    ("etl_pipeline/facebook/realtime/fb_page_consumer.py", 60),
+    ("etl_pipeline/facebook/competitor_analysis/extract_facebook_apify.py", 150),
+    ("etl_pipeline/facebook/competitor_analysis/load_competitor_raw.py", 150),
+]
+
+def parse_importtime(stderr, module_name):
+    """
+    Returns (cumulative us of the module, its direct imports) from -X importtime output.
+    Lines look like: 'import time:  self [us] | cumulative | <indent>package'
+    """
+    total = None
+    children = []
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+
+        if depth == 1:
+            children.append((int(cumulative), name.strip()))
+        elif depth == 0:
+            if name.strip() == module_name:
+                total = int(cumulative)
+                break
+            children = []
+
+    children.sort(reverse=True)
+    return total, children
+
+def measure(script_path):
+    script_dir = os.path.join(BASE_DIR, os.path.dirname(script_path))
+    module_name = os.path.splitext(os.path.basename(script_path))[0]
+    code = f"import sys; sys.path.insert(0, {script_dir!r}); import {module_name}"
+
+    timings = []
+    children = []
+
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True
+        )
+
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1:]
+
+        total, children = parse_importtime(result.stderr, module_name)
+        if total is None:
+            return None, ["module import not found in -X importtime output"]
+        timings.append(total)
+
+    return statistics.median(timings) / 1000, children[:5]
+
+def main():
+    print("--- STARTUP TIME BENCHMARK ---")
+    failed = 0
+
+    for script_path, budget_ms in ENTRY_POINTS:
+        elapsed_ms, details = measure(script_path)
+
+        if elapsed_ms is None:
+            failed += 1
+            print(f"[ERROR] {script_path}: {' '.join(details)}")
+            continue
+
+        status = "OK" if elapsed_ms <= budget_ms else "OVER BUDGET"
+        if elapsed_ms > budget_ms:
+            failed += 1
+
+        print(f"[{status}] {script_path}: {elapsed_ms:.1f} ms (budget {budget_ms} ms)")
+        for cumulative, name in details:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+    print("-" * 30)
+    if failed:
+        print(f"{failed} entry point(s) failed the startup budget")
+        sys.exit(1)
+
+    print("All entry points are within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+#Behaviour tests of the batched database sink, the transaction is faked so no database is needed.
+#Run from the project root: python -m pytest tests/test_batch_sink.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline"))
+
+pytest.importorskip("psycopg2")
+
+from common import db
+from common.db import BatchSink
+
+
+class FakeDatabase:
+    """Stands in for transaction() and execute_values, the next `failures` batches raise."""
+
+    def __init__(self, monkeypatch):
+        self.batches = []
+        self.failures = 0
+        monkeypatch.setattr(db, "transaction", self.transaction)
+        monkeypatch.setattr("psycopg2.extras.execute_values", self.execute_values)
+        monkeypatch.setattr(db.time, "sleep", lambda seconds: None)
+
+    @contextmanager
+    def transaction(self):
+        yield self
+
+    def cursor(self):
+        return None
+
+    def execute_values(self, cur, sql, rows, page_size=None):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("connection lost")
+        self.batches.append(list(rows))
+
+
+def new_sink(**kwargs):
+    return BatchSink("INSERT INTO t (a) VALUES %s", flush_interval=0.01, **kwargs)
+
+
+def test_tokens_come_back_in_order_once_written(monkeypatch):
+    database = FakeDatabase(monkeypatch)
+
+    with new_sink(batch_size=2) as sink:
+        sink.write((1,), ("t", 0, 10))
+        sink.mark(("t", 0, 11))
+        sink.write((2,), ("t", 0, 12))
+        sink.flush()
+
+        assert [row for batch in database.batches for row in batch] == [(1,), (2,)]
+        assert sink.take_written() == [("t", 0, 10), ("t", 0, 11), ("t", 0, 12)]
+        #Handed back only once
+        assert sink.take_written() == []
+
+    assert sink.written == 2
+
+
+def test_failed_batch_is_retried(monkeypatch):
+    database = FakeDatabase(monkeypatch)
+    database.failures = 2
+
+    with new_sink(max_retries=2) as sink:
+        sink.write((1,), "a")
+        sink.flush()
+
+        assert database.batches == [[(1,)]]
+        assert sink.take_written() == ["a"]
+        assert sink.error is None
+
+
+def test_sink_stops_without_acknowledging_after_the_retries(monkeypatch):
+    database = FakeDatabase(monkeypatch)
+
+    with new_sink(max_retries=1) as sink:
+        sink.write((1,), "a")
+        sink.flush()
+        database.failures = 2
+        sink.write((2,), "b")
+        sink.flush()
+
+        assert isinstance(sink.error, RuntimeError)
+        assert sink.take_written() == ["a"]
+        with pytest.raises(RuntimeError):
+            sink.write((3,), "c")
+        with pytest.raises(RuntimeError):
+            sink.mark("d")
+
+    assert sink.written == 1
+
+
+def test_close_writes_what_is_left(monkeypatch):
+    database = FakeDatabase(monkeypatch)
+
+    sink = new_sink(batch_size=100)
+    sink.flush_interval = 60
+    for i in range(3):
+        sink.write((i,), i)
+    sink.close()
+
+    assert database.batches == [[(0,), (1,), (2,)]]
+    assert sink.take_written() == [0, 1, 2]
+    with pytest.raises(RuntimeError):
+        sink.write((4,))
@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+
+#Behaviour tests of the extraction checkpoints, no API needed.
+#Run from the project root: python -m pytest tests/test_checkpoints.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline"))
+
+from common import checkpoints
+from common.checkpoints import load_checkpoint, save_checkpoint, clear_checkpoint, open_output, write_page
+
+
+def test_resume_truncates_the_unfinished_page(tmp_path):
+    output = str(tmp_path / "videos.jsonl")
+
+    with open_output(output) as f:
+        write_page(f, [{"id": 1}, {"id": 2}])
+        offset = f.tell()
+        #A page written after the last checkpoint, the run died before saving it
+        write_page(f, [{"id": 3}])
+
+    with open_output(output, {"file_offset": offset}) as f:
+        write_page(f, [{"id": 4}])
+
+    with open(output, encoding="utf-8") as f:
+        assert [json.loads(line)["id"] for line in f] == [1, 2, 4]
+
+
+def test_checkpoint_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    output = tmp_path / "posts.jsonl"
+    output.write_text("")
+
+    save_checkpoint("posts", {"output_file": str(output), "next_after": "abc", "file_offset": 0})
+    state = load_checkpoint("posts")
+    assert state["next_after"] == "abc"
+    assert "saved_at" in state
+
+    clear_checkpoint("posts")
+    assert load_checkpoint("posts") is None
+
+
+def test_stale_or_orphaned_checkpoints_are_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_DIR", str(tmp_path))
+
+    save_checkpoint("orphan", {"output_file": str(tmp_path / "missing.jsonl"), "file_offset": 0})
+    assert load_checkpoint("orphan") is None
+
+    output = tmp_path / "old.jsonl"
+    output.write_text("")
+    with open(checkpoints.checkpoint_path("old"), "w", encoding="utf-8") as f:
+        json.dump({"output_file": str(output), "file_offset": 0, "saved_at": "2000-01-01T00:00:00"}, f)
+    assert load_checkpoint("old") is None
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pandas as pd
+
+#Behaviour tests of the content enrichment stage, no database or API needed.
+#Run from the project root: python -m pytest tests/test_enrich_content.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline"))
+
+from common.enrich_content import (
+    compute_text_features, guess_language, enrich_text, load_cache, save_cache, iso_duration_to_seconds
+)
+
+
+def test_language_guess():
+    texts = {
+        "Schön heute": "de",
+        "Ich wünsche dir": "de",
+        "Ça va": "fr",
+        "São Paulo é linda": "pt",
+        "El niño está aquí": "es",
+        "Çok güzel bir gün": "tr",
+        "İstanbul": "tr",
+        "hello world": "en",
+        "привет": "ru",
+        "東京に行きます": "ja",
+        "北京": "zh",
+        "123 !!": "und",
+        "": "und"
+    }
+    guesses = guess_language(pd.Series(list(texts)))
+
+    assert dict(zip(texts, guesses)) == texts
+
+
+def test_text_features():
+    features = compute_text_features(pd.Series(["New #video with @team, mail a@b.co https://x.io 🎉", None]))
+
+    assert features["hashtags"].tolist() == [["video"], []]
+    assert features["mentions"].tolist() == [["team"], []]
+    assert features["urls"].tolist() == [["https://x.io"], []]
+    assert features["emoji_count"].tolist() == [1, 0]
+    assert features["text_length"].tolist() == [49, 0]
+
+
+def test_one_character_mentions():
+    features = compute_text_features(pd.Series(["@a and @b.c."]))
+
+    assert features["mentions"].tolist() == [["a", "b.c"]]
+
+
+def test_enrich_text_only_computes_new_texts(tmp_path, monkeypatch):
+    import common.enrich_content as enrich_content
+
+    computed = []
+    original = enrich_content.compute_text_features
+    monkeypatch.setattr(enrich_content, "compute_text_features", lambda texts: computed.append(len(texts)) or original(texts))
+
+    cache = load_cache(str(tmp_path))
+    df, cache = enrich_text(pd.DataFrame({"title": ["#a", "#a", "b"]}), "title", cache)
+    assert computed == [2]
+    assert df["hashtags"].tolist() == [["a"], ["a"], []]
+
+    #Same run: only the unseen text is processed
+    enrich_text(pd.DataFrame({"title": ["b", "c"]}), "title", cache)
+    assert computed == [2, 1]
+
+    #Next run: everything comes from the saved part
+    save_cache(cache, str(tmp_path))
+    df, _ = enrich_text(pd.DataFrame({"title": ["c", "#a"]}), "title", load_cache(str(tmp_path)))
+    assert computed == [2, 1]
+    assert df["hashtags"].tolist() == [[], ["a"]]
+    assert df["language"].tolist() == ["en", "en"]
+
+
+def test_enrich_text_prefix_keeps_index():
+    df = pd.DataFrame({"text": ["x #y"]}, index=[7])
+    df, _ = enrich_text(df, "text", load_cache("/nonexistent"), prefix="text_")
+
+    assert df.index.tolist() == [7]
+    assert df.loc[7, "text_hashtags"] == ["y"]
+
+
+def test_iso_duration_to_seconds():
+    durations = pd.Series(["PT1H2M3S", "PT45S", "P1DT2H", "PT0S", "", None, "garbage"])
+    seconds = iso_duration_to_seconds(durations)
+
+    assert seconds.iloc[:4].tolist() == [3723, 45, 93600, 0]
+    assert seconds.iloc[4:].isna().all()
@@ -0,0 +1,82 @@
+import os
+import sys
+import json
+
+import pytest
+
+#Behaviour tests of the fb_realtime_events wire format, no Kafka needed.
+#Run from the project root: python -m pytest tests/test_event_codec.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline", "facebook", "realtime"))
+
+import event_codec
+from event_codec import encode_event, decode_event, get_schema, MAGIC_BYTE, FORMAT_JSON, FORMAT_MSGPACK
+
+TOPIC = "fb_realtime_events"
+
+EVENT = {
+    "source_page": "104857600000000",
+    "post_id": "104857600000000_900000000000001",
+    "message": "Yeni bölüm yayında!",
+    "created_time": "2026-10-19T08:30:00+0000",
+    "metrics": {"likes": 12, "comments": 3},
+    "ingested_at": "2026-10-19T08:31:00+00:00"
+}
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    data = encode_event(TOPIC, EVENT, FORMAT_MSGPACK)
+
+    assert data[0] == MAGIC_BYTE
+    assert data[1] == get_schema(TOPIC)[0]
+    assert len(data) < len(json.dumps(EVENT).encode("utf-8"))
+    assert decode_event(TOPIC, data) == EVENT
+
+
+def test_missing_fields_come_back_as_none():
+    pytest.importorskip("msgpack")
+    data = encode_event(TOPIC, {"post_id": "1", "metrics": {"likes": 5}}, FORMAT_MSGPACK)
+    event = decode_event(TOPIC, data)
+
+    assert event["post_id"] == "1"
+    assert event["metrics"] == {"likes": 5, "comments": None}
+    assert event["source_page"] is None
+
+
+def test_json_messages_are_still_decoded():
+    data = encode_event(TOPIC, EVENT, FORMAT_JSON)
+
+    assert data.startswith(b"{")
+    assert decode_event(TOPIC, data) == EVENT
+
+
+def test_json_fallback_without_msgpack(monkeypatch):
+    monkeypatch.setattr(event_codec, "msgpack", None)
+
+    assert event_codec.resolve_format(FORMAT_MSGPACK) == FORMAT_JSON
+    assert json.loads(encode_event(TOPIC, EVENT, FORMAT_MSGPACK)) == EVENT
+    with pytest.raises(RuntimeError):
+        decode_event(TOPIC, bytes((MAGIC_BYTE, 1)) + b"\x90")
+
+
+def test_the_version_byte_selects_the_schema(monkeypatch):
+    pytest.importorskip("msgpack")
+    registry = {TOPIC: {"latest": 2, "versions": {
+        "1": {"fields": ["post_id", "metrics.likes"]},
+        "2": {"fields": ["post_id", "metrics.likes", "metrics.shares"]}
+    }}}
+    monkeypatch.setattr(event_codec, "load_registry", lambda: registry)
+    event_codec.get_schema.cache_clear()
+
+    try:
+        #A consumer on version 2 still reads messages written with version 1
+        old = bytes((MAGIC_BYTE, 1)) + event_codec.msgpack.packb(["1", 7])
+        assert decode_event(TOPIC, old) == {"post_id": "1", "metrics": {"likes": 7}}
+
+        new = encode_event(TOPIC, {"post_id": "1", "metrics": {"likes": 7, "shares": 2}}, FORMAT_MSGPACK)
+        assert new[1] == 2
+        assert decode_event(TOPIC, new) == {"post_id": "1", "metrics": {"likes": 7, "shares": 2}}
+    finally:
+        event_codec.get_schema.cache_clear()
@@ -0,0 +1,59 @@
+import os
+import sys
+import json
+
+#Behaviour tests of the shared YouTube quota budget, no API needed.
+#Run from the project root: python -m pytest tests/test_quota_budget.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline", "youtube"))
+
+import extract_youtube
+from extract_youtube import QuotaBudget
+
+
+def test_spend_stops_at_the_daily_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract_youtube, "quota_day", lambda: "2026-01-01")
+    quota = QuotaBudget(daily_units=3, usage_file=str(tmp_path / "usage.json"))
+
+    assert [quota.spend(), quota.spend(), quota.spend(), quota.spend()] == [True, True, True, False]
+    assert quota.exhausted
+
+
+def test_usage_is_shared_by_the_runs_of_one_day(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract_youtube, "quota_day", lambda: "2026-01-01")
+    usage_file = str(tmp_path / "state" / "usage.json")
+
+    QuotaBudget(daily_units=5, usage_file=usage_file).spend(4)
+
+    #A later run of the same day only gets what is left
+    rerun = QuotaBudget(daily_units=5, usage_file=usage_file)
+    assert rerun.used_units == 4
+    assert rerun.spend()
+    assert not rerun.spend()
+
+
+def test_a_new_quota_day_starts_from_zero(tmp_path, monkeypatch):
+    day = ["2026-01-01"]
+    monkeypatch.setattr(extract_youtube, "quota_day", lambda: day[0])
+    usage_file = str(tmp_path / "usage.json")
+
+    quota = QuotaBudget(daily_units=2, usage_file=usage_file)
+    quota.mark_exhausted()
+    assert not quota.spend()
+    assert QuotaBudget(daily_units=2, usage_file=usage_file).exhausted
+
+    #A long run rolls over at midnight Pacific time, a new run reads a fresh day
+    day[0] = "2026-01-02"
+    assert quota.spend()
+    assert not QuotaBudget(daily_units=2, usage_file=usage_file).exhausted
+
+    with open(usage_file, encoding="utf-8") as f:
+        assert json.load(f) == {"day": "2026-01-02", "used_units": 1}
+
+
+def test_unreadable_usage_file_is_ignored(tmp_path):
+    usage_file = tmp_path / "usage.json"
+    usage_file.write_text("{broken")
+
+    assert QuotaBudget(daily_units=2, usage_file=str(usage_file)).used_units == 0
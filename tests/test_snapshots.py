@@ -0,0 +1,60 @@
+import os
+import sys
+import datetime
+
+#Behaviour tests of the snapshot partition helpers, no database needed.
+#Run from the project root: python -m pytest tests/test_snapshots.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline"))
+
+from common.snapshots import add_months, month_start, partition_name, drop_expired_partitions
+
+TABLE = "bronze.youtube_video_snapshots"
+
+
+class FakeCursor:
+    """Answers the pg_inherits lookup with the given partitions and records the statements."""
+
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split()))
+
+    def fetchall(self):
+        return [(name,) for name in self.partitions]
+
+
+def test_add_months_crosses_years():
+    assert add_months(datetime.date(2026, 11, 1), 1) == datetime.date(2026, 12, 1)
+    assert add_months(datetime.date(2026, 12, 1), 1) == datetime.date(2027, 1, 1)
+    assert add_months(datetime.date(2026, 1, 1), -1) == datetime.date(2025, 12, 1)
+    assert add_months(datetime.date(2026, 3, 1), -26) == datetime.date(2024, 1, 1)
+
+
+def test_partition_name():
+    month = month_start(datetime.datetime(2026, 2, 17, 10, 30))
+    assert partition_name(TABLE, month) == "bronze.youtube_video_snapshots_y2026m02"
+
+
+def test_only_partitions_before_the_retention_window_are_dropped():
+    cur = FakeCursor([
+        "youtube_video_snapshots_y2023m12",
+        "youtube_video_snapshots_y2024m01",
+        "youtube_video_snapshots_y2024m02",
+        "youtube_video_snapshots_y2024m03",
+        "youtube_video_snapshots_y2026m03",
+        "youtube_video_snapshots_default"
+    ])
+
+    #Retention of 24 months from March 2026: the window starts in March 2024
+    dropped = drop_expired_partitions(cur, TABLE, datetime.datetime(2026, 3, 5), retention_months=24)
+
+    assert dropped == [
+        "youtube_video_snapshots_y2023m12",
+        "youtube_video_snapshots_y2024m01",
+        "youtube_video_snapshots_y2024m02"
+    ]
+    assert cur.statements[1:] == [f"DROP TABLE IF EXISTS bronze.{name};" for name in dropped]
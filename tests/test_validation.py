@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+
+import pandas as pd
+
+#Behaviour tests of the batch validator, no database or API needed.
+#Run from the project root: python -m pytest tests/test_validation.py
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "etl_pipeline"))
+
+from common import validation
+from common.validation import validate_batch, validate_and_quarantine, REASON_COLUMN
+
+
+def youtube_rows():
+    return pd.DataFrame({
+        "video_id": ["a", "", "c", "d", "e"],
+        "title": ["ok", "no id", "bad date", "bad count", "negative"],
+        "published_at": ["2026-01-01T10:00:00Z", "2026-01-01T10:00:00Z", "yesterday",
+                         "2026-01-02T10:00:00+0000", "2026-01-03T10:00:00"],
+        "view_count": ["10", "1", "2", "many", "-5"],
+        "like_count": [1, 1, 1, 1, 1],
+        "comment_count": [0, 0, 0, 0, None]
+    })
+
+
+def test_clean_rows_are_kept_and_coerced():
+    clean, rejected = validate_batch(youtube_rows(), "youtube_video")
+
+    assert clean["video_id"].tolist() == ["a"]
+    assert clean["view_count"].tolist() == [10]
+    assert pd.api.types.is_numeric_dtype(clean["view_count"])
+    assert len(rejected) == 4
+
+
+def test_rejected_rows_carry_their_reasons():
+    _, rejected = validate_batch(youtube_rows(), "youtube_video")
+    reasons = dict(zip(rejected["video_id"], rejected[REASON_COLUMN]))
+
+    assert reasons[""] == "missing video_id"
+    assert reasons["c"] == "invalid timestamp published_at"
+    assert reasons["d"] == "invalid int view_count"
+    assert reasons["e"] == "negative view_count"
+
+
+def test_several_failures_are_joined():
+    df = pd.DataFrame({"date": ["not a day"], "total_usd": [-1.5]})
+    _, rejected = validate_batch(df, "revenue_day")
+
+    assert rejected[REASON_COLUMN].iloc[0] == "invalid date date; negative total_usd"
+
+
+def test_missing_required_column_rejects_every_row():
+    df = pd.DataFrame({"post_id": ["1", "2"], "message": ["a", "b"]})
+    clean, rejected = validate_batch(df, "facebook_post")
+
+    assert clean.empty
+    assert set(rejected[REASON_COLUMN]) == {"missing created_at"}
+
+
+def test_fractional_counts_are_not_ints():
+    df = pd.DataFrame({"post_id": ["1", "2"], "like_count": [3.0, 2.5]})
+    clean, rejected = validate_batch(df, "competitor_post")
+
+    assert clean["post_id"].tolist() == ["1"]
+    assert rejected[REASON_COLUMN].tolist() == ["invalid int like_count"]
+
+
+def test_quarantine_writes_valid_json_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(validation, "QUARANTINE_DIR", str(tmp_path))
+
+    clean = validate_and_quarantine(youtube_rows(), "youtube_video", "data/raw/youtube_videos_2026-01-01.jsonl")
+    path = tmp_path / "youtube_video" / "youtube_videos_2026-01-01.jsonl"
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    assert len(clean) == 1
+    assert [r["video_id"] for r in records] == ["", "c", "d", "e"]
+    assert records[3]["comment_count"] is None
+    assert all(r[REASON_COLUMN] and r["quarantined_at"] for r in records)
+
+
+def test_channel_partitions_get_their_own_quarantine_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(validation, "QUARANTINE_DIR", str(tmp_path))
+    monkeypatch.setattr(validation, "RAW_DIR", str(tmp_path / "raw"))
+
+    for channel in ["UC1", "UC2"]:
+        source = tmp_path / "raw" / "youtube" / channel / "youtube_videos_2026-01-01.jsonl"
+        validate_and_quarantine(youtube_rows(), "youtube_video", str(source))
+
+    for channel in ["UC1", "UC2"]:
+        path = tmp_path / "youtube_video" / "youtube" / channel / "youtube_videos_2026-01-01.jsonl"
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+
+
+def test_sources_outside_raw_use_their_file_name(tmp_path):
+    assert validation.quarantine_name("facebook_raw_revenue_2026-01-01") == "facebook_raw_revenue_2026-01-01"
+    assert validation.quarantine_name(str(tmp_path / "posts.json")) == "posts"